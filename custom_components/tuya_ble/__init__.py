@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
 import logging
+from typing import Any
 
 from bleak_retry_connector import BLEAK_RETRY_EXCEPTIONS as BLEAK_EXCEPTIONS, get_device
 
@@ -12,11 +14,21 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS, EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.event import async_track_time_interval
 
 from .tuya_ble import TuyaBLEDevice
+from .tuya_ble.const import DEFAULT_IDLE_DISCONNECT_DELAY
+from .tuya_ble.exceptions import TuyaBLEError
 
 from .cloud import HASSTuyaBLEDeviceManager
-from .const import DOMAIN
+from .const import (
+    CONF_FIRE_AND_FORGET,
+    CONF_IDLE_DISCONNECT_DELAY,
+    CONF_ON_DEMAND_CONNECTION,
+    CONF_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DOMAIN,
+)
 from .devices import TuyaBLECoordinator, TuyaBLEData, get_device_product_info
 
 PLATFORMS: list[Platform] = [
@@ -35,6 +47,18 @@ PLATFORMS: list[Platform] = [
 _LOGGER = logging.getLogger(__name__)
 
 
+def _get_connection_settings(options: dict[str, Any]) -> dict[str, Any]:
+    """Connection settings of the entry, with defaults applied."""
+    return {
+        CONF_ON_DEMAND_CONNECTION: options.get(CONF_ON_DEMAND_CONNECTION, False),
+        CONF_IDLE_DISCONNECT_DELAY: options.get(
+            CONF_IDLE_DISCONNECT_DELAY, DEFAULT_IDLE_DISCONNECT_DELAY
+        ),
+        CONF_POLL_INTERVAL: options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+        CONF_FIRE_AND_FORGET: options.get(CONF_FIRE_AND_FORGET, False),
+    }
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Tuya BLE from a config entry."""
     address: str = entry.data[CONF_ADDRESS]
@@ -46,11 +70,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             f"Could not find Tuya BLE device with address {address}"
         )
     manager = HASSTuyaBLEDeviceManager(hass, entry.options.copy())
-    device = TuyaBLEDevice(manager, ble_device)
+    settings = _get_connection_settings(entry.options)
+    device = TuyaBLEDevice(
+        manager,
+        ble_device,
+        on_demand=settings[CONF_ON_DEMAND_CONNECTION],
+        idle_disconnect_delay=settings[CONF_IDLE_DISCONNECT_DELAY],
+    )
     await device.initialize()
     product_info = get_device_product_info(device)
 
-    coordinator = TuyaBLECoordinator(hass, device)
+    coordinator = TuyaBLECoordinator(hass, device, settings[CONF_FIRE_AND_FORGET])
 
     """
     try:
@@ -62,6 +92,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
     hass.add_job(device.update())
 
+    if device.on_demand:
+
+        async def _async_poll(_) -> None:
+            """Refresh the status over a short-lived connection."""
+            try:
+                await device.update()
+            except (*BLEAK_EXCEPTIONS, TuyaBLEError):
+                _LOGGER.debug("%s: Status refresh failed", address, exc_info=True)
+
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, _async_poll, timedelta(seconds=settings[CONF_POLL_INTERVAL])
+            )
+        )
+
     @callback
     def _async_update_ble(
         service_info: bluetooth.BluetoothServiceInfoBleak,
@@ -87,6 +132,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         product_info,
         manager,
         coordinator,
+        settings,
     )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -105,7 +151,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     data: TuyaBLEData = hass.data[DOMAIN][entry.entry_id]
-    if entry.title != data.title:
+    if entry.title != data.title or data.settings != _get_connection_settings(
+        entry.options
+    ):
         await hass.config_entries.async_reload(entry.entry_id)
 
 
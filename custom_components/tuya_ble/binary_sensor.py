@@ -21,7 +21,12 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from .const import (
     DOMAIN,
 )
-from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .devices import (
+    TuyaBLEData,
+    TuyaBLEEntity,
+    TuyaBLEProductInfo,
+    get_mapping_dp_ids,
+)
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -139,7 +144,14 @@ class TuyaBLEBinarySensor(TuyaBLEEntity, BinarySensorEntity):
         product: TuyaBLEProductInfo,
         mapping: TuyaBLEBinarySensorMapping,
     ) -> None:
-        super().__init__(hass, coordinator, device, product, mapping.description)
+        super().__init__(
+            hass,
+            coordinator,
+            device,
+            product,
+            mapping.description,
+            get_mapping_dp_ids(mapping),
+        )
         self._mapping = mapping
 
     @callback
@@ -19,7 +19,12 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.helpers.entity import EntityCategory
 
 from .const import DOMAIN
-from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .devices import (
+    TuyaBLEData,
+    TuyaBLEEntity,
+    TuyaBLEProductInfo,
+    get_mapping_dp_ids,
+)
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -229,10 +234,17 @@ class TuyaBLEButton(TuyaBLEEntity, ButtonEntity):
         product: TuyaBLEProductInfo,
         mapping: TuyaBLEButtonMapping,
     ) -> None:
-        super().__init__(hass, coordinator, device, product, mapping.description)
+        super().__init__(
+            hass,
+            coordinator,
+            device,
+            product,
+            mapping.description,
+            get_mapping_dp_ids(mapping),
+        )
         self._mapping = mapping
 
-    def press(self) -> None:
+    async def async_press(self) -> None:
         """Press the button."""
         datapoint = self._device.datapoints.get_or_create(
             self._mapping.dp_id,
@@ -242,9 +254,9 @@ class TuyaBLEButton(TuyaBLEEntity, ButtonEntity):
         if datapoint:
             if self._product.lock:
                 # Lock needs true to activate lock/unlock commands
-                self._hass.create_task(datapoint.set_value(True))
+                await self._async_set_value(datapoint, True)
             else:
-                self._hass.create_task(datapoint.set_value(not bool(datapoint.value)))
+                await self._async_set_value(datapoint, not bool(datapoint.value))
 
     @property
     def available(self) -> bool:
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from dataclasses import dataclass
+import hashlib
 import json
+import time
 from typing import Any, Iterable
 
 from homeassistant.const import (
@@ -16,7 +19,9 @@ from homeassistant.const import (
     CONF_USERNAME,
 )
 
+from homeassistant.components.bluetooth import async_discovered_service_info
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 
 from tuya_iot import (
     TuyaOpenAPI,
@@ -26,6 +31,7 @@ from tuya_iot import (
 from .tuya_ble import (
     AbstaractTuyaBLEDeviceManager,
     TuyaBLEDeviceCredentials,
+    decode_advertised_ids,
 )
 
 from .const import (
@@ -44,10 +50,15 @@ from .const import (
     CONF_PRODUCT_NAME,
     CONF_FUNCTIONS,
     CONF_STATUS_RANGE,
+    CLOUD_CACHE_STORAGE_KEY,
+    CLOUD_CACHE_STORAGE_VERSION,
+    CLOUD_CACHE_TTL,
     DOMAIN,
     TUYA_API_DEVICES_URL,
     TUYA_API_FACTORY_INFO_URL,
     TUYA_API_DEVICE_SPECIFICATION,
+    TUYA_API_MAX_CONCURRENT_REQUESTS,
+    TUYA_FACTORY_INFO_BATCH_SIZE,
     TUYA_FACTORY_INFO_MAC,
     TUYA_RESPONSE_RESULT,
     TUYA_RESPONSE_SUCCESS,
@@ -63,6 +74,9 @@ class TuyaCloudCacheItem:
     api: TuyaOpenAPI | None
     login: dict[str, Any]
     credentials: dict[str, dict[str, Any]]
+    # Ids of the devices of the account whose credentials were not fetched,
+    # None until the device list is fetched
+    skipped_ids: set[str] | None = None
 
 
 CONF_TUYA_LOGIN_KEYS = [
@@ -88,6 +102,26 @@ CONF_TUYA_DEVICE_KEYS = [
 ]
 
 _cache: dict[str, TuyaCloudCacheItem] = {}
+# Cache key of the login the device with the address belongs to
+_address_index: dict[str, str] = {}
+
+# Credentials persisted between restarts, keyed by hash of the cache key
+# as the key contains the login secrets
+_store: Store | None = None
+_stored_cache: dict[str, dict[str, Any]] | None = None
+
+
+def _get_stored_cache_key(cache_key: str) -> str:
+    return hashlib.sha256(cache_key.encode()).hexdigest()
+
+
+async def _async_load_stored_cache(hass: HomeAssistant) -> dict[str, dict[str, Any]]:
+    global _store, _stored_cache
+    if _stored_cache is None:
+        _store = Store(hass, CLOUD_CACHE_STORAGE_VERSION, CLOUD_CACHE_STORAGE_KEY)
+        data = await _store.async_load()
+        _stored_cache = data if isinstance(data, dict) else {}
+    return _stored_cache
 
 
 class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
@@ -97,6 +131,8 @@ class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
         assert hass is not None
         self._hass = hass
         self._data = data
+        self._cache_key: str | None = None
+        self._cache_key_login: tuple | None = None
 
     @staticmethod
     def _is_login_success(response: dict[Any, Any]) -> bool:
@@ -107,6 +143,14 @@ class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
         key_dict = {key: data.get(key) for key in CONF_TUYA_LOGIN_KEYS}
         return json.dumps(key_dict)
 
+    def _get_data_cache_key(self) -> str:
+        """Cache key of the login in data, computed again only if it changes."""
+        login = tuple(self._data.get(key) for key in CONF_TUYA_LOGIN_KEYS)
+        if self._cache_key is None or login != self._cache_key_login:
+            self._cache_key = self._get_cache_key(self._data)
+            self._cache_key_login = login
+        return self._cache_key
+
     @staticmethod
     def _has_login(data: dict[Any, Any]) -> bool:
         for key in CONF_TUYA_LOGIN_KEYS:
@@ -160,80 +204,241 @@ class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
 
         return response
 
+    async def _get_cache_item(
+        self, data: dict[str, Any], cache_key: str | None = None
+    ) -> TuyaCloudCacheItem | None:
+        """Get the cache item, restoring it from storage when still fresh."""
+        global _cache
+        if cache_key is None:
+            cache_key = self._get_cache_key(data)
+        item = _cache.get(cache_key)
+        if item is None:
+            stored_cache = await _async_load_stored_cache(self._hass)
+            stored = stored_cache.get(_get_stored_cache_key(cache_key))
+            if stored and time.time() - stored.get("updated", 0) < CLOUD_CACHE_TTL:
+                _LOGGER.debug("Restored %s cached devices", len(stored["credentials"]))
+                # Not logged in yet, login is done when the cache is refreshed
+                skipped_ids = stored.get("skipped_ids")
+                item = TuyaCloudCacheItem(
+                    None,
+                    {key: data.get(key) for key in CONF_TUYA_LOGIN_KEYS},
+                    dict(stored["credentials"]),
+                    set(skipped_ids) if skipped_ids is not None else None,
+                )
+                _cache[cache_key] = item
+                for address in item.credentials:
+                    _address_index[address] = cache_key
+        return item
+
+    async def _async_save_cache_item(self, item: TuyaCloudCacheItem) -> None:
+        stored_cache = await _async_load_stored_cache(self._hass)
+        now = time.time()
+        stored_key = _get_stored_cache_key(self._get_cache_key(item.login))
+        stored_cache[stored_key] = {
+            "updated": now,
+            "credentials": item.credentials,
+            "skipped_ids": (
+                sorted(item.skipped_ids) if item.skipped_ids is not None else None
+            ),
+        }
+        # Drop expired items and items of logins which are no longer used
+        logins = self._get_config_entry_stored_cache_keys()
+        logins.add(stored_key)
+        for key in list(stored_cache):
+            if (
+                key not in logins
+                or now - stored_cache[key].get("updated", 0) >= CLOUD_CACHE_TTL
+            ):
+                del stored_cache[key]
+        await _store.async_save(stored_cache)
+
+    def _get_config_entry_stored_cache_keys(self) -> set[str]:
+        """Keys of the stored items of the logins used by config entries."""
+        keys: set[str] = set()
+        for config_entry in self._hass.config_entries.async_entries(TUYA_DOMAIN):
+            keys.add(_get_stored_cache_key(self._get_cache_key(config_entry.data)))
+        for config_entry in self._hass.config_entries.async_entries(DOMAIN):
+            if self._has_login(config_entry.options):
+                keys.add(
+                    _get_stored_cache_key(self._get_cache_key(config_entry.options))
+                )
+        return keys
+
+    @staticmethod
+    def _has_all_devices(item: TuyaCloudCacheItem) -> bool:
+        """Whether credentials of all devices of the account were fetched."""
+        return item.skipped_ids is not None and not item.skipped_ids
+
     def _check_login(self) -> bool:
-        cache_key = self._get_cache_key(self._data)
-        return _cache.get(cache_key) is not None
+        return _cache.get(self._get_data_cache_key()) is not None
 
     async def login(self, add_to_cache: bool = False) -> dict[Any, Any]:
         return await self._login(self._data, add_to_cache)
 
-    async def _fill_cache_item(self, item: TuyaCloudCacheItem) -> None:
+    async def _get_factory_infos(
+        self, api: TuyaOpenAPI, device_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Get factory infos of the devices, requested in batches."""
+        result: dict[str, dict[str, Any]] = {}
+        for i in range(0, len(device_ids), TUYA_FACTORY_INFO_BATCH_SIZE):
+            batch = device_ids[i : i + TUYA_FACTORY_INFO_BATCH_SIZE]
+            response = await self._hass.async_add_executor_job(
+                api.get,
+                TUYA_API_FACTORY_INFO_URL % ",".join(batch),
+            )
+            factory_infos = response.get(TUYA_RESPONSE_RESULT)
+            if isinstance(factory_infos, Iterable):
+                for factory_info in factory_infos:
+                    if factory_info and (device_id := factory_info.get("id")):
+                        result[device_id] = factory_info
+        return result
+
+    async def _get_specifications(
+        self, api: TuyaOpenAPI, device_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Get specifications of the devices, a few requests at once."""
+        semaphore = asyncio.Semaphore(TUYA_API_MAX_CONCURRENT_REQUESTS)
+
+        async def get_specification(device_id: str) -> dict[str, Any] | None:
+            async with semaphore:
+                response = await self._hass.async_add_executor_job(
+                    api.get,
+                    TUYA_API_DEVICE_SPECIFICATION % device_id,
+                )
+            return response.get(TUYA_RESPONSE_RESULT)
+
+        specifications = await asyncio.gather(
+            *(get_specification(device_id) for device_id in device_ids)
+        )
+        return {
+            device_id: specification
+            for device_id, specification in zip(device_ids, specifications)
+            if specification
+        }
+
+    def _get_advertised_ids(self) -> tuple[set[str], set[str]]:
+        """Get product ids and uuids of the Tuya devices seen nearby."""
+        product_ids: set[str] = set()
+        uuids: set[str] = set()
+        for service_info in async_discovered_service_info(self._hass, False):
+            try:
+                product_id, uuid = decode_advertised_ids(
+                    service_info.service_data, service_info.manufacturer_data
+                )
+            except (UnicodeDecodeError, ValueError):
+                continue
+            if product_id:
+                product_ids.add(product_id)
+            if uuid:
+                uuids.add(uuid)
+        return (product_ids, uuids)
+
+    def _filter_ble_devices(
+        self, devices: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Keep the devices which were seen advertising nearby."""
+        product_ids, uuids = self._get_advertised_ids()
+        return [
+            device
+            for device in devices
+            if device.get("uuid") in uuids or device.get("product_id") in product_ids
+        ]
+
+    async def _fill_cache_item(
+        self, item: TuyaCloudCacheItem, address: str | None = None
+    ) -> None:
+        """Fill the cache item with the devices of the account seen nearby.
+
+        All devices are filled in if the device with the address is not
+        among them, as it may not have been advertising during the scan.
+        Otherwise the ids of the devices left out are kept, so a device
+        not fetched can be told apart from a device not on the account.
+        """
+        started = time.monotonic()
         devices_response = await self._hass.async_add_executor_job(
             item.api.get,
             TUYA_API_DEVICES_URL % (item.api.token_info.uid),
         )
-        if devices_response.get(TUYA_RESPONSE_RESULT):
-            devices = devices_response.get(TUYA_RESPONSE_RESULT)
-            if isinstance(devices, Iterable):
-                for device in devices:
-                    fi_response = await self._hass.async_add_executor_job(
-                        item.api.get,
-                        TUYA_API_FACTORY_INFO_URL % (device.get("id")),
-                    )
-
-                    fi_response_result = fi_response.get(TUYA_RESPONSE_RESULT)
-                    if fi_response_result and len(fi_response_result) > 0:
-                        factory_info = fi_response_result[0]
-                        if factory_info and (TUYA_FACTORY_INFO_MAC in factory_info):
-                            mac = ":".join(
-                                factory_info[TUYA_FACTORY_INFO_MAC][i : i + 2]
-                                for i in range(0, 12, 2)
-                            ).upper()
-                            item.credentials[mac] = {
-                                CONF_ADDRESS: mac,
-                                CONF_UUID: device.get("uuid"),
-                                CONF_LOCAL_KEY: device.get("local_key"),
-                                CONF_DEVICE_ID: device.get("id"),
-                                CONF_CATEGORY: device.get("category"),
-                                CONF_PRODUCT_ID: device.get("product_id"),
-                                CONF_DEVICE_NAME: device.get("name"),
-                                CONF_PRODUCT_MODEL: device.get("model"),
-                                CONF_PRODUCT_NAME: device.get("product_name"),
-                            }
-
-                            spec_response = await self._hass.async_add_executor_job(
-                                item.api.get,
-                                TUYA_API_DEVICE_SPECIFICATION % device.get("id"),
-                            )
-
-                            spec_response_result = spec_response.get(
-                                TUYA_RESPONSE_RESULT
-                            )
-                            if spec_response_result:
-                                functions = spec_response_result.get("functions")
-                                if functions:
-                                    item.credentials[mac][CONF_FUNCTIONS] = functions
-                                status = spec_response_result.get("status")
-                                if status:
-                                    item.credentials[mac][CONF_STATUS_RANGE] = status
-
-                            spec_response = await self._hass.async_add_executor_job(
-                                item.api.get,
-                                TUYA_API_DEVICE_SPECIFICATION % device.get("id"),
-                            )
-
-                            spec_response_result = spec_response.get(
-                                TUYA_RESPONSE_RESULT
-                            )
-                            if spec_response_result:
-                                functions = spec_response_result.get("functions")
-                                if functions:
-                                    item.credentials[mac][CONF_FUNCTIONS] = functions
-                                status = spec_response_result.get("status")
-                                if status:
-                                    item.credentials[mac][CONF_STATUS_RANGE] = status
-
-    async def build_cache(self) -> None:
+        devices = devices_response.get(TUYA_RESPONSE_RESULT)
+        if devices and isinstance(devices, Iterable):
+            _LOGGER.debug(
+                "Fetched %s devices in %.2fs", len(devices), time.monotonic() - started
+            )
+            nearby = self._filter_ble_devices(devices)
+            _LOGGER.debug("%s of %s devices seen nearby", len(nearby), len(devices))
+            await self._fill_credentials(item, nearby)
+            known_ids = {
+                credentials.get(CONF_DEVICE_ID)
+                for credentials in item.credentials.values()
+            }
+            skipped = [
+                device for device in devices if device.get("id") not in known_ids
+            ]
+            if address is not None and address not in item.credentials and skipped:
+                await self._fill_credentials(item, skipped)
+                skipped = []
+            item.skipped_ids = {device.get("id") for device in skipped}
+            await self._async_save_cache_item(item)
+
+    async def _fill_credentials(
+        self, item: TuyaCloudCacheItem, devices: list[dict[str, Any]]
+    ) -> None:
+        """Add credentials of the devices to the cache item."""
+        if not devices:
+            return
+        started = time.monotonic()
+        cache_key = self._get_cache_key(item.login)
+        device_ids = [device.get("id") for device in devices]
+        factory_infos = await self._get_factory_infos(item.api, device_ids)
+        factory_infos_fetched = time.monotonic()
+
+        macs: dict[str, str] = {}
+        for device in devices:
+            factory_info = factory_infos.get(device.get("id"))
+            if factory_info and (TUYA_FACTORY_INFO_MAC in factory_info):
+                mac = ":".join(
+                    factory_info[TUYA_FACTORY_INFO_MAC][i : i + 2]
+                    for i in range(0, 12, 2)
+                ).upper()
+                item.credentials[mac] = {
+                    CONF_ADDRESS: mac,
+                    CONF_UUID: device.get("uuid"),
+                    CONF_LOCAL_KEY: device.get("local_key"),
+                    CONF_DEVICE_ID: device.get("id"),
+                    CONF_CATEGORY: device.get("category"),
+                    CONF_PRODUCT_ID: device.get("product_id"),
+                    CONF_DEVICE_NAME: device.get("name"),
+                    CONF_PRODUCT_MODEL: device.get("model"),
+                    CONF_PRODUCT_NAME: device.get("product_name"),
+                }
+                macs[device.get("id")] = mac
+                _address_index[mac] = cache_key
+
+        specifications = await self._get_specifications(item.api, list(macs))
+        for device_id, specification in specifications.items():
+            credentials = item.credentials[macs[device_id]]
+            functions = specification.get("functions")
+            if functions:
+                credentials[CONF_FUNCTIONS] = functions
+            status = specification.get("status")
+            if status:
+                credentials[CONF_STATUS_RANGE] = status
+
+        _LOGGER.debug(
+            "Fetched factory infos of %s devices in %.2fs, "
+            "specifications of %s in %.2fs",
+            len(factory_infos),
+            factory_infos_fetched - started,
+            len(specifications),
+            time.monotonic() - factory_infos_fetched,
+        )
+
+    async def build_cache(self, address: str | None = None) -> None:
+        """Fill the cache from the known logins.
+
+        If the address is given, its device is looked up among all devices
+        of the accounts when it was not seen advertising.
+        """
         global _cache
         data = {}
         tuya_config_entries = self._hass.config_entries.async_entries(TUYA_DOMAIN)
@@ -241,11 +446,11 @@ class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
             data.clear()
             data.update(config_entry.data)
             key = self._get_cache_key(data)
-            item = _cache.get(key)
-            if item is None or len(item.credentials) == 0:
+            item = await self._get_cache_item(data, key)
+            if item is None or item.skipped_ids is None:
                 if self._is_login_success(await self._login(data, True)):
                     item = _cache.get(key)
-                    if item and len(item.credentials) == 0:
+                    if item and item.skipped_ids is None:
                         await self._fill_cache_item(item)
 
         ble_config_entries = self._hass.config_entries.async_entries(DOMAIN)
@@ -253,13 +458,36 @@ class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
             data.clear()
             data.update(config_entry.options)
             key = self._get_cache_key(data)
-            item = _cache.get(key)
-            if item is None or len(item.credentials) == 0:
+            item = await self._get_cache_item(data, key)
+            if item is None or item.skipped_ids is None:
                 if self._is_login_success(await self._login(data, True)):
                     item = _cache.get(key)
-                    if item and len(item.credentials) == 0:
+                    if item and item.skipped_ids is None:
                         await self._fill_cache_item(item)
 
+        if address is not None:
+            # Also fills in the devices which were not seen advertising
+            await self._find_cache_item(address)
+
+    async def _find_cache_item(self, address: str) -> TuyaCloudCacheItem | None:
+        """Get the cache item with the device, looked up in all accounts."""
+        items = list(_cache.values())
+        for item in items:
+            if address in item.credentials:
+                return item
+        for item in items:
+            # The device is not on the account of a fully fetched item
+            if self._has_all_devices(item):
+                continue
+            if item.api is None and not self._is_login_success(
+                await self._login(dict(item.login), True)
+            ):
+                continue
+            await self._fill_cache_item(item, address)
+            if address in item.credentials:
+                return item
+        return None
+
     def get_login_from_cache(self) -> None:
         global _cache
         for cache_item in _cache.values():
@@ -283,20 +511,26 @@ class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
         else:
             cache_key: str | None = None
             if self._has_login(self._data):
-                cache_key = self._get_cache_key(self._data)
+                cache_key = self._get_data_cache_key()
+                item = await self._get_cache_item(self._data, cache_key)
             else:
-                for key in _cache.keys():
-                    if _cache[key].credentials.get(address) is not None:
-                        cache_key = key
-                        break
-            if cache_key:
-                item = _cache.get(cache_key)
-
-            if item is None or force_update:
+                cache_key = _address_index.get(address)
+                if cache_key:
+                    item = _cache.get(cache_key)
+                else:
+                    item = await self._find_cache_item(address)
+
+            # Missing devices are looked up only among the devices which
+            # were left out, foreign devices must not log in again and again
+            if (
+                item is None
+                or force_update
+                or (address not in item.credentials and not self._has_all_devices(item))
+            ):
                 if self._is_login_success(await self.login(True)):
                     item = _cache.get(cache_key)
                     if item:
-                        await self._fill_cache_item(item)
+                        await self._fill_cache_item(item, address)
 
             if item:
                 credentials = item.credentials.get(address)
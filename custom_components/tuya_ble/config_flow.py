@@ -28,6 +28,7 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowHandler, FlowResult
 
 from .tuya_ble import SERVICE_UUID, TuyaBLEDeviceCredentials
+from .tuya_ble.const import DEFAULT_IDLE_DISCONNECT_DELAY
 
 from .const import (
     TUYA_COUNTRIES,
@@ -41,7 +42,13 @@ from .const import (
     CONF_APP_TYPE,
     CONF_AUTH_TYPE,
     CONF_ENDPOINT,
+    CONF_FIRE_AND_FORGET,
+    CONF_IDLE_DISCONNECT_DELAY,
+    CONF_ON_DEMAND_CONNECTION,
+    CONF_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
     DOMAIN,
+    SET_DISCONNECTED_DELAY,
 )
 from .devices import TuyaBLEData, get_device_readable_name
 from .cloud import HASSTuyaBLEDeviceManager
@@ -161,7 +168,11 @@ class TuyaBLEOptionsFlow(OptionsFlowWithConfigEntry):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
-        return await self.async_step_login(user_input)
+        # Connection settings can be changed without logging in to the cloud
+        return self.async_show_menu(
+            step_id="init",
+            menu_options=["login", "settings"],
+        )
 
     async def async_step_login(
         self, user_input: dict[str, Any] | None = None
@@ -202,6 +213,48 @@ class TuyaBLEOptionsFlow(OptionsFlowWithConfigEntry):
 
         return _show_login_form(self, user_input, errors, placeholders)
 
+    async def async_step_settings(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle the connection settings step."""
+        if user_input is not None:
+            self.options.update(user_input)
+            return self.async_create_entry(
+                title=self.config_entry.title,
+                data=self.options,
+            )
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_ON_DEMAND_CONNECTION,
+                        default=options.get(CONF_ON_DEMAND_CONNECTION, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_IDLE_DISCONNECT_DELAY,
+                        default=options.get(
+                            CONF_IDLE_DISCONNECT_DELAY, DEFAULT_IDLE_DISCONNECT_DELAY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                    vol.Required(
+                        CONF_POLL_INTERVAL,
+                        default=options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+                    ): vol.All(
+                        # Entities become unavailable if not refreshed in time
+                        vol.Coerce(int),
+                        vol.Range(min=30, max=SET_DISCONNECTED_DELAY - 60),
+                    ),
+                    vol.Required(
+                        CONF_FIRE_AND_FORGET,
+                        default=options.get(CONF_FIRE_AND_FORGET, False),
+                    ): bool,
+                }
+            ),
+        )
+
 
 class TuyaBLEConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Tuya BLE."""
@@ -226,7 +279,7 @@ class TuyaBLEConfigFlow(ConfigFlow, domain=DOMAIN):
         self._discovery_info = discovery_info
         if self._manager is None:
             self._manager = HASSTuyaBLEDeviceManager(self.hass, self._data)
-        await self._manager.build_cache()
+        await self._manager.build_cache(discovery_info.address)
         self.context["title_placeholders"] = {
             "name": await get_device_readable_name(
                 discovery_info,
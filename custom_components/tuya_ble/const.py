@@ -14,6 +14,8 @@ DEVICE_METADATA_UUIDS: Final = "uuids"
 
 DEVICE_DEF_MANUFACTURER: Final = "Tuya"
 SET_DISCONNECTED_DELAY = 10 * 60
+# Seconds a service call waits for the device to confirm a command
+COMMAND_TIMEOUT = 30
 
 CONF_UUID: Final = "uuid"
 CONF_LOCAL_KEY: Final = "local_key"
@@ -25,6 +27,13 @@ CONF_PRODUCT_NAME: Final = "product_name"
 CONF_FUNCTIONS: Final = "functions"
 CONF_STATUS_RANGE: Final = "status_range"
 
+CONF_ON_DEMAND_CONNECTION: Final = "on_demand_connection"
+CONF_IDLE_DISCONNECT_DELAY: Final = "idle_disconnect_delay"
+CONF_POLL_INTERVAL: Final = "poll_interval"
+CONF_FIRE_AND_FORGET: Final = "fire_and_forget"
+
+DEFAULT_POLL_INTERVAL: Final = 5 * 60
+
 CONF_AUTH_TYPE: Final = "auth_type"
 CONF_PROJECT_TYPE: Final = "tuya_project_type"
 CONF_ENDPOINT: Final = "endpoint"
@@ -54,6 +63,12 @@ TUYA_API_DEVICES_URL: Final = "/v1.0/users/%s/devices"
 TUYA_API_FACTORY_INFO_URL: Final = "/v1.0/iot-03/devices/factory-infos?device_ids=%s"
 TUYA_API_DEVICE_SPECIFICATION: Final = "/v1.1/devices/%s/specifications"
 TUYA_FACTORY_INFO_MAC: Final = "mac"
+TUYA_FACTORY_INFO_BATCH_SIZE: Final = 20
+TUYA_API_MAX_CONCURRENT_REQUESTS: Final = 4
+
+CLOUD_CACHE_STORAGE_KEY: Final = f"{DOMAIN}.cloud_cache"
+CLOUD_CACHE_STORAGE_VERSION: Final = 1
+CLOUD_CACHE_TTL: Final = 7 * 24 * 60 * 60
 
 BATTERY_STATE_LOW: Final = "low"
 BATTERY_STATE_NORMAL: Final = "normal"
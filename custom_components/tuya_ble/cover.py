@@ -225,10 +225,12 @@ class TuyaBLECover(TuyaBLEEntity, CoverEntity):
                     time_now=datetime.now(timezone.utc)
                 )
             )
-            self._update_cover_state_without_validation(state)
+            await self._update_cover_state_without_validation(state)
             self._update_ha_state_for_cover_state(state)
 
-    def _update_cover_state_without_validation(self, state: TuyaCoverState) -> None:
+    async def _update_cover_state_without_validation(
+        self, state: TuyaCoverState
+    ) -> None:
         if self._mapping.cover_state_dp_id != 0:
             datapoint = self._device.datapoints.get_or_create(
                 self._mapping.cover_state_dp_id,
@@ -236,7 +238,7 @@ class TuyaBLECover(TuyaBLEEntity, CoverEntity):
                 state.value,
             )
             if datapoint:
-                self._hass.create_task(datapoint.set_value(state.value))
+                await self._async_set_value(datapoint, state.value)
 
     async def _validate_data_update_from_device_and_reconnect_if_needed(
         self,
@@ -281,7 +283,7 @@ class TuyaBLECover(TuyaBLEEntity, CoverEntity):
                 position,
             )
             if datapoint:
-                self._hass.create_task(datapoint.set_value(position))
+                await self._async_set_value(datapoint, position)
 
 
 async def async_setup_entry(
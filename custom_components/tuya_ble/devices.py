@@ -1,6 +1,8 @@
 """The Tuya BLE integration."""
 
 from __future__ import annotations
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
 from dataclasses import dataclass
 from typing import Any
 
@@ -8,6 +10,7 @@ import logging
 from homeassistant.const import CONF_ADDRESS, CONF_DEVICE_ID
 
 from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity import (
     DeviceInfo,
@@ -36,6 +39,7 @@ from .tuya_ble import (
 
 from .cloud import HASSTuyaBLEDeviceManager
 from .const import (
+    COMMAND_TIMEOUT,
     DEVICE_DEF_MANUFACTURER,
     DOMAIN,
     FINGERBOT_BUTTON_EVENT,
@@ -95,8 +99,11 @@ class TuyaBLEEntity(CoordinatorEntity):
         device: TuyaBLEDevice,
         product: TuyaBLEProductInfo,
         description: EntityDescription,
+        dp_ids: Iterable[int] | None = None,
     ) -> None:
-        super().__init__(coordinator)
+        # Entity is updated only when one of the datapoints changes,
+        # on every update when they are not known
+        super().__init__(coordinator, frozenset(dp_ids) if dp_ids is not None else None)
         self._hass = hass
         self._coordinator = coordinator
         self._device = device
@@ -126,23 +133,76 @@ class TuyaBLEEntity(CoordinatorEntity):
         """Handle updated data from the coordinator."""
         self.async_write_ha_state()
 
-    def send_dp_value(
+    async def _async_set_value(
+        self,
+        datapoint: TuyaBLEDataPoint,
+        value: bytes | bool | int | str,
+    ) -> None:
+        """Set the value, waiting for the device unless writes are not awaited."""
+        if self._coordinator.fire_and_forget:
+            self._hass.async_create_task(datapoint.set_value(value))
+        else:
+            await self._async_wait_for_device(datapoint.set_value(value))
+
+    async def _async_wait_for_device(self, operation: Awaitable[None]) -> None:
+        """Wait for the device to confirm the command, for a limited time."""
+        try:
+            async with asyncio.timeout(COMMAND_TIMEOUT):
+                await operation
+        except TimeoutError as err:
+            raise HomeAssistantError(
+                f"{self._device.address}: device did not confirm the command"
+                f" within {COMMAND_TIMEOUT} seconds"
+            ) from err
+
+    def _get_datapoint(
         self,
         key: DPCode | None,
         dp_type: TuyaBLEDataPointType,
         value: bytes | bool | int | str | None = None,
-    ) -> None:
+    ) -> TuyaBLEDataPoint | None:
         dpid = self.find_dpid(key)
         if dpid is not None:
-            datapoint = self._device.datapoints.get_or_create(
+            return self._device.datapoints.get_or_create(
                 dpid,
                 dp_type,
                 value,
             )
-            self._hass.create_task(datapoint.set_value(value))
+        return None
+
+    async def async_send_dp_value(
+        self,
+        key: DPCode | None,
+        dp_type: TuyaBLEDataPointType,
+        value: bytes | bool | int | str | None = None,
+    ) -> None:
+        if datapoint := self._get_datapoint(key, dp_type, value):
+            await self._async_set_value(datapoint, value)
 
-    def _send_command(self, commands: list[dict[str, Any]]) -> None:
+    async def _async_send_command(self, commands: list[dict[str, Any]]) -> None:
         """Send the commands to the device"""
+        datapoints = self._device.datapoints
+        # Values are collected and sent in one frame by end_update()
+        datapoints.begin_update()
+        try:
+            await self._async_add_commands(commands)
+        finally:
+            if self._coordinator.fire_and_forget:
+                self._hass.async_create_task(datapoints.end_update())
+            else:
+                await self._async_wait_for_device(datapoints.end_update())
+
+    async def _async_add_dp_value(
+        self,
+        key: DPCode | None,
+        dp_type: TuyaBLEDataPointType,
+        value: bytes | bool | int | str | None = None,
+    ) -> None:
+        # Inside an update the value is only recorded, set_value() does not wait
+        if datapoint := self._get_datapoint(key, dp_type, value):
+            await datapoint.set_value(value)
+
+    async def _async_add_commands(self, commands: list[dict[str, Any]]) -> None:
         for command in commands:
             code = command.get("code")
             value = command.get("value")
@@ -152,7 +212,9 @@ class TuyaBLEEntity(CoordinatorEntity):
                 if isinstance(value, str):
                     # We suppose here that cloud JSON type are sent as string
                     if dttype in (DPType.STRING, DPType.JSON):
-                        self.send_dp_value(code, TuyaBLEDataPointType.DT_STRING, value)
+                        await self._async_add_dp_value(
+                            code, TuyaBLEDataPointType.DT_STRING, value
+                        )
                     elif dttype == DPType.ENUM:
                         int_value = 0
                         values = self.device.function[code].values
@@ -162,14 +224,18 @@ class TuyaBLEEntity(CoordinatorEntity):
                                 int_value = (
                                     range.index(value) if value in range else None
                                 )
-                        self.send_dp_value(
+                        await self._async_add_dp_value(
                             code, TuyaBLEDataPointType.DT_ENUM, int_value
                         )
 
                 elif isinstance(value, bool):
-                    self.send_dp_value(code, TuyaBLEDataPointType.DT_BOOL, value)
+                    await self._async_add_dp_value(
+                        code, TuyaBLEDataPointType.DT_BOOL, value
+                    )
                 else:
-                    self.send_dp_value(code, TuyaBLEDataPointType.DT_VALUE, value)
+                    await self._async_add_dp_value(
+                        code, TuyaBLEDataPointType.DT_VALUE, value
+                    )
 
     def find_dpid(
         self, dpcode: DPCode | None, prefer_function: bool = False
@@ -262,10 +328,22 @@ class TuyaBLEEntity(CoordinatorEntity):
         return None
 
 
+def get_mapping_dp_ids(mapping: Any) -> tuple[int, ...] | None:
+    """Datapoints the state of a mapped entity depends on, None if unknown."""
+    if getattr(mapping, "getter", None) or getattr(mapping, "is_available", None):
+        return None
+    return (mapping.dp_id,)
+
+
 class TuyaBLECoordinator(DataUpdateCoordinator[None]):
     """Data coordinator for receiving Tuya BLE updates."""
 
-    def __init__(self, hass: HomeAssistant, device: TuyaBLEDevice) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        device: TuyaBLEDevice,
+        fire_and_forget: bool = False,
+    ) -> None:
         """Initialise the coordinator."""
         super().__init__(
             hass,
@@ -273,8 +351,15 @@ class TuyaBLECoordinator(DataUpdateCoordinator[None]):
             name=DOMAIN,
         )
         self._device = device
+        self._fire_and_forget = fire_and_forget
         self._disconnected: bool = True
         self._unsub_disconnect: CALLBACK_TYPE | None = None
+        self._suppressed_updates = 0
+        self._unchanged_updates = 0
+        # Values of the datapoints the entities were last updated with
+        self._dispatched_values: dict[int, Any] = {}
+        # Datapoint ids each listener depends on, None for all of them
+        self._subscribers: dict[object, tuple[CALLBACK_TYPE, Any]] = {}
         device.register_connected_callback(self._async_handle_connect)
         device.register_callback(self._async_handle_update)
         device.register_disconnected_callback(self._async_handle_disconnect)
@@ -283,10 +368,42 @@ class TuyaBLECoordinator(DataUpdateCoordinator[None]):
     def connected(self) -> bool:
         return not self._disconnected
 
+    @property
+    def fire_and_forget(self) -> bool:
+        """Commands return without waiting for the device to confirm them."""
+        return self._fire_and_forget
+
+    @property
+    def suppressed_updates(self) -> int:
+        """Entity updates skipped as their datapoints did not change."""
+        return self._suppressed_updates
+
+    @property
+    def unchanged_updates(self) -> int:
+        """Datapoint updates which did not change any of the values."""
+        return self._unchanged_updates
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, context holds the datapoint ids."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        key = object()
+        self._subscribers[key] = (update_callback, context)
+
+        @callback
+        def remove_subscriber() -> None:
+            self._subscribers.pop(key, None)
+            remove_listener()
+
+        return remove_subscriber
+
     @callback
     def _async_handle_connect(self) -> None:
         if self._unsub_disconnect is not None:
             self._unsub_disconnect()
+            self._unsub_disconnect = None
         if self._disconnected:
             self._disconnected = False
             self.async_update_listeners()
@@ -295,7 +412,7 @@ class TuyaBLECoordinator(DataUpdateCoordinator[None]):
     def _async_handle_update(self, updates: list[TuyaBLEDataPoint]) -> None:
         """Just trigger the callbacks."""
         self._async_handle_connect()
-        self.async_set_updated_data(None)
+        self._async_update_subscribers(updates)
         info = get_device_product_info(self._device)
         if info and info.fingerbot and info.fingerbot.manual_control != 0:
             for update in updates:
@@ -308,11 +425,34 @@ class TuyaBLECoordinator(DataUpdateCoordinator[None]):
                         },
                     )
 
+    @callback
+    def _async_update_subscribers(self, updates: list[TuyaBLEDataPoint]) -> None:
+        """Update the listeners depending on the changed datapoints."""
+        dp_ids: set[int] = set()
+        for update in updates:
+            # Compared with the dispatched value, not the previous one, so a
+            # report confirming a value set by the user is dispatched too
+            if (
+                update.id not in self._dispatched_values
+                or self._dispatched_values[update.id] != update.value
+            ):
+                self._dispatched_values[update.id] = update.value
+                dp_ids.add(update.id)
+        if not dp_ids:
+            self._unchanged_updates += 1
+        for update_callback, context in list(self._subscribers.values()):
+            if dp_ids and (context is None or not dp_ids.isdisjoint(context)):
+                update_callback()
+            else:
+                self._suppressed_updates += 1
+
     @callback
     def _set_disconnected(self, _: None) -> None:
         """Invoke the idle timeout callback, called when the alarm fires."""
         self._disconnected = True
         self._unsub_disconnect = None
+        # Values may change unseen while the device is away
+        self._dispatched_values.clear()
         self.async_update_listeners()
 
     @callback
@@ -334,6 +474,7 @@ class TuyaBLEData:
     product: TuyaBLEProductInfo
     manager: HASSTuyaBLEDeviceManager
     coordinator: TuyaBLECoordinator
+    settings: dict[str, Any]
 
 
 @dataclass
@@ -2,6 +2,11 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.components.diagnostics import async_redact_data
 
+from .const import DOMAIN
+from .devices import TuyaBLEData
+from .tuya_ble import TuyaBLEDevice
+from .tuya_ble.connection import get_connection_source
+
 TO_REDACT = {
     "username",
     "password",
@@ -19,9 +24,36 @@ async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry):
         "data": entry.data,
         "options": entry.options,
     }
+    entry_data: TuyaBLEData | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if entry_data:
+        data["device"] = _get_device_diagnostics(entry_data.device)
+        data["coordinator"] = {
+            "suppressed_updates": entry_data.coordinator.suppressed_updates,
+            "unchanged_updates": entry_data.coordinator.unchanged_updates,
+        }
     return async_redact_data(data, TO_REDACT)
 
 
+def _get_device_diagnostics(device: TuyaBLEDevice) -> dict:
+    return {
+        **device.get_diagnostics(),
+        "connection_state": device.connection_state.value,
+        "connection_source": get_connection_source(device.ble_device),
+        "connect_wait": device.connect_wait_stats.as_dict(),
+        "inflight_window": device.inflight_window,
+        "latency": {
+            metric.value: histogram.as_dict()
+            for metric, histogram in device.latency.items()
+        },
+        "packet_trace": device.packet_trace.as_list(),
+        "reconnect": device.reconnect_policy.as_dict(),
+        "rtt": {
+            code.name: estimator.as_dict()
+            for code, estimator in device.rtt_estimators.items()
+        },
+    }
+
+
 async def async_get_device_diagnostics(hass: HomeAssistant, entry, device):
     # Optional: if your integration uses devices (via the device registry)
     device_data = {
@@ -619,7 +619,7 @@ class TuyaBLELight(TuyaBLEEntity, LightEntity):
         """Return true if light is on."""
         return self.device.status.get(self.entity_description.key, False)
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on or control the light."""
         commands = [{"code": self.entity_description.key, "value": True}]
 
@@ -738,12 +738,14 @@ class TuyaBLELight(TuyaBLEEntity, LightEntity):
                 },
             ]
 
-        self._send_command(commands)
+        await self._async_send_command(commands)
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Instruct the light to turn off."""
 
-        self._send_command([{"code": self.entity_description.key, "value": False}])
+        await self._async_send_command(
+            [{"code": self.entity_description.key, "value": False}]
+        )
 
     @property
     def brightness(self) -> int | None:
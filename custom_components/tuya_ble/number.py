@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 
 import logging
-from typing import Callable
+from typing import Awaitable, Callable
 
 from homeassistant.components.number import (
     NumberEntityDescription,
@@ -28,7 +28,12 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN
-from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .devices import (
+    TuyaBLEData,
+    TuyaBLEEntity,
+    TuyaBLEProductInfo,
+    get_mapping_dp_ids,
+)
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -42,7 +47,7 @@ TuyaBLENumberIsAvailable = Callable[["TuyaBLENumber", TuyaBLEProductInfo], bool]
 
 
 TuyaBLENumberSetter = (
-    Callable[["TuyaBLENumber", TuyaBLEProductInfo, float], None] | None
+    Callable[["TuyaBLENumber", TuyaBLEProductInfo, float], Awaitable[None]] | None
 )
 
 
@@ -131,7 +136,7 @@ def get_fingerbot_program_repeat_count(
     return result
 
 
-def set_fingerbot_program_repeat_count(
+async def set_fingerbot_program_repeat_count(
     self: TuyaBLENumber,
     product: TuyaBLEProductInfo,
     value: float,
@@ -140,7 +145,7 @@ def set_fingerbot_program_repeat_count(
         datapoint = self._device.datapoints[product.fingerbot.program]
         if datapoint and isinstance(datapoint.value, bytes):
             new_value = int.to_bytes(int(value), 2, "big") + datapoint.value[2:]
-            self._hass.create_task(datapoint.set_value(new_value))
+            await self._async_set_value(datapoint, new_value)
 
 
 def get_fingerbot_program_position(
@@ -156,7 +161,7 @@ def get_fingerbot_program_position(
     return result
 
 
-def set_fingerbot_program_position(
+async def set_fingerbot_program_position(
     self: TuyaBLENumber,
     product: TuyaBLEProductInfo,
     value: float,
@@ -166,7 +171,7 @@ def set_fingerbot_program_position(
         if datapoint and isinstance(datapoint.value, bytes):
             new_value = bytearray(datapoint.value)
             new_value[2] = int(value)
-            self._hass.create_task(datapoint.set_value(new_value))
+            await self._async_set_value(datapoint, new_value)
 
 
 @dataclass
@@ -716,7 +721,14 @@ class TuyaBLENumber(TuyaBLEEntity, NumberEntity):
         product: TuyaBLEProductInfo,
         mapping: TuyaBLENumberMapping,
     ) -> None:
-        super().__init__(hass, coordinator, device, product, mapping.description)
+        super().__init__(
+            hass,
+            coordinator,
+            device,
+            product,
+            mapping.description,
+            get_mapping_dp_ids(mapping),
+        )
         self._mapping = mapping
         self._attr_mode = mapping.mode
 
@@ -732,10 +744,10 @@ class TuyaBLENumber(TuyaBLEEntity, NumberEntity):
 
         return self._mapping.description.native_min_value
 
-    def set_native_value(self, value: float) -> None:
+    async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
         if self._mapping.setter:
-            self._mapping.setter(self, self._product, value)
+            await self._mapping.setter(self, self._product, value)
             return
         int_value = int(value * self._mapping.coefficient)
         datapoint = self._device.datapoints.get_or_create(
@@ -744,7 +756,7 @@ class TuyaBLENumber(TuyaBLEEntity, NumberEntity):
             int(int_value),
         )
         if datapoint:
-            self._hass.create_task(datapoint.set_value(int_value))
+            await self._async_set_value(datapoint, int_value)
 
     @property
     def available(self) -> bool:
@@ -23,7 +23,12 @@ from .const import (
     FINGERBOT_MODE_PUSH,
     FINGERBOT_MODE_SWITCH,
 )
-from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .devices import (
+    TuyaBLEData,
+    TuyaBLEEntity,
+    TuyaBLEProductInfo,
+    get_mapping_dp_ids,
+)
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -410,7 +415,14 @@ class TuyaBLESelect(TuyaBLEEntity, SelectEntity):
         product: TuyaBLEProductInfo,
         mapping: TuyaBLESelectMapping,
     ) -> None:
-        super().__init__(hass, coordinator, device, product, mapping.description)
+        super().__init__(
+            hass,
+            coordinator,
+            device,
+            product,
+            mapping.description,
+            get_mapping_dp_ids(mapping),
+        )
         self._mapping = mapping
         self._attr_options = mapping.description.options
 
@@ -428,7 +440,7 @@ class TuyaBLESelect(TuyaBLEEntity, SelectEntity):
             return value
         return None
 
-    def select_option(self, value: str) -> None:
+    async def async_select_option(self, value: str) -> None:
         """Change the selected option."""
         if value in self._attr_options:
             int_value = self._attr_options.index(value)
@@ -438,7 +450,7 @@ class TuyaBLESelect(TuyaBLEEntity, SelectEntity):
                 int_value,
             )
             if datapoint:
-                self._hass.create_task(datapoint.set_value(int_value))
+                await self._async_set_value(datapoint, int_value)
 
 
 async def async_setup_entry(
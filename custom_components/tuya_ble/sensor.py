@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 import logging
 from typing import Callable
 from homeassistant.components.sensor import (
@@ -24,6 +25,7 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from .const import (
     BATTERY_STATE_HIGH,
@@ -36,11 +38,21 @@ from .const import (
     CO2_LEVEL_NORMAL,
     DOMAIN,
 )
-from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .devices import (
+    TuyaBLEData,
+    TuyaBLEEntity,
+    TuyaBLEProductInfo,
+    get_mapping_dp_ids,
+)
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
+from .tuya_ble.connection import TuyaBLELatency
 
 _LOGGER = logging.getLogger(__name__)
 SIGNAL_STRENGTH_DP_ID = -1
+LATENCY_DP_ID = -2
+PROTOCOL_STATS_DP_ID = -3
+# Connection statistics change without datapoint updates, so they are refreshed
+STATISTICS_REFRESH_INTERVAL = 60
 TuyaBLESensorIsAvailable = Callable[["TuyaBLESensor", TuyaBLEProductInfo], bool] | None
 
 
@@ -56,6 +68,12 @@ class TuyaBLESensorMapping:
     coefficient: float = 1.0
     icons: list[str] | None = None
     is_available: TuyaBLESensorIsAvailable = None
+    # Seconds after which the state is written even if it did not change,
+    # for sensors which need heartbeat writes; off by default
+    force_write_interval: float | None = None
+    # Seconds after which the state is read again, for values which change
+    # without datapoint updates; unchanged states are not recorded again
+    refresh_interval: float | None = None
 
 
 @dataclass
@@ -953,6 +971,82 @@ rssi_mapping = TuyaBLESensorMapping(
 )
 
 
+def get_latency_getter(
+    metric: TuyaBLELatency,
+) -> Callable[[TuyaBLESensor], None]:
+    def latency_getter(sensor: TuyaBLESensor) -> None:
+        histogram = sensor._device.latency[metric]
+        if histogram.count:
+            sensor._attr_native_value = round(histogram.last * 1000)
+            sensor._attr_extra_state_attributes = {
+                "count": histogram.count,
+                "mean": round(histogram.mean * 1000),
+                "p50": round(histogram.percentile(50) * 1000),
+                "p95": round(histogram.percentile(95) * 1000),
+            }
+        else:
+            sensor._attr_native_value = None
+
+    return latency_getter
+
+
+latency_mappings = [
+    TuyaBLESensorMapping(
+        dp_id=LATENCY_DP_ID,
+        description=SensorEntityDescription(
+            key=f"{metric.value}_latency",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        getter=get_latency_getter(metric),
+        refresh_interval=STATISTICS_REFRESH_INTERVAL,
+    )
+    for metric in TuyaBLELatency
+]
+
+
+def get_protocol_stats_getter(key: str) -> Callable[[TuyaBLESensor], None]:
+    def protocol_stats_getter(sensor: TuyaBLESensor) -> None:
+        sensor._attr_native_value = getattr(sensor._device.protocol_stats, key)
+
+    return protocol_stats_getter
+
+
+def dropped_frames_getter(sensor: TuyaBLESensor) -> None:
+    dropped_frames = sensor._device.protocol_stats.dropped_frames
+    sensor._attr_native_value = sum(dropped_frames.values())
+    sensor._attr_extra_state_attributes = dropped_frames
+
+
+protocol_stats_mappings = [
+    TuyaBLESensorMapping(
+        dp_id=PROTOCOL_STATS_DP_ID,
+        description=SensorEntityDescription(
+            key=key,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        getter=(
+            dropped_frames_getter
+            if key == "dropped_frames"
+            else get_protocol_stats_getter(key)
+        ),
+        refresh_interval=STATISTICS_REFRESH_INTERVAL,
+    )
+    for key in (
+        "fragments_received",
+        "frames_received",
+        "dropped_frames",
+        "crc_errors",
+        "unknown_codes",
+    )
+]
+
+
 def get_mapping_by_device(device: TuyaBLEDevice) -> list[TuyaBLESensorMapping]:
     category = mapping.get(device.category)
     if category is not None and category.products is not None:
@@ -976,8 +1070,46 @@ class TuyaBLESensor(TuyaBLEEntity, SensorEntity):
         product: TuyaBLEProductInfo,
         mapping: TuyaBLESensorMapping,
     ) -> None:
-        super().__init__(hass, coordinator, device, product, mapping.description)
+        super().__init__(
+            hass,
+            coordinator,
+            device,
+            product,
+            mapping.description,
+            get_mapping_dp_ids(mapping),
+        )
         self._mapping = mapping
+        if mapping.force_write_interval:
+            # Every write is recorded, also the periodic ones
+            self._attr_force_update = True
+
+    async def async_added_to_hass(self) -> None:
+        """Start the periodic refresh and writes requested by the mapping."""
+        await super().async_added_to_hass()
+        if self._mapping.refresh_interval:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_refresh,
+                    timedelta(seconds=self._mapping.refresh_interval),
+                )
+            )
+        if self._mapping.force_write_interval:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_force_write,
+                    timedelta(seconds=self._mapping.force_write_interval),
+                )
+            )
+
+    @callback
+    def _async_force_write(self, _: datetime) -> None:
+        self._handle_coordinator_update()
+
+    @callback
+    def _async_refresh(self, _: datetime) -> None:
+        self._handle_coordinator_update()
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -1036,6 +1168,16 @@ async def async_setup_entry(
             rssi_mapping,
         )
     ]
+    for mapping in latency_mappings + protocol_stats_mappings:
+        entities.append(
+            TuyaBLESensor(
+                hass,
+                data.coordinator,
+                data.device,
+                data.product,
+                mapping,
+            )
+        )
     for mapping in mappings:
         if mapping.force_add or data.device.datapoints.has_id(
             mapping.dp_id, mapping.dp_type
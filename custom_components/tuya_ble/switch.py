@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 
 import logging
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable
 
 from homeassistant.components.switch import (
     SwitchEntityDescription,
@@ -19,7 +19,12 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN
-from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .devices import (
+    TuyaBLEData,
+    TuyaBLEEntity,
+    TuyaBLEProductInfo,
+    get_mapping_dp_ids,
+)
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -33,7 +38,9 @@ TuyaBLESwitchGetter = (
 TuyaBLESwitchIsAvailable = Callable[["TuyaBLESwitch", TuyaBLEProductInfo], bool] | None
 
 
-TuyaBLESwitchSetter = Callable[["TuyaBLESwitch", TuyaBLEProductInfo, bool], None] | None
+TuyaBLESwitchSetter = (
+    Callable[["TuyaBLESwitch", TuyaBLEProductInfo, bool], Awaitable[None]] | None
+)
 
 
 @dataclass
@@ -93,7 +100,7 @@ def get_fingerbot_program_repeat_forever(
     return result
 
 
-def set_fingerbot_program_repeat_forever(
+async def set_fingerbot_program_repeat_forever(
     self: TuyaBLESwitch, product: TuyaBLEProductInfo, value: bool
 ) -> None:
     if product.fingerbot and product.fingerbot.program:
@@ -102,7 +109,7 @@ def set_fingerbot_program_repeat_forever(
             new_value = (
                 int.to_bytes(0xFFFF if value else 1, 2, "big") + datapoint.value[2:]
             )
-            self._hass.create_task(datapoint.set_value(new_value))
+            await self._async_set_value(datapoint, new_value)
 
 
 @dataclass
@@ -570,7 +577,14 @@ class TuyaBLESwitch(TuyaBLEEntity, SwitchEntity):
         product: TuyaBLEProductInfo,
         mapping: TuyaBLESwitchMapping,
     ) -> None:
-        super().__init__(hass, coordinator, device, product, mapping.description)
+        super().__init__(
+            hass,
+            coordinator,
+            device,
+            product,
+            mapping.description,
+            get_mapping_dp_ids(mapping),
+        )
         self._mapping = mapping
 
     @property
@@ -596,10 +610,10 @@ class TuyaBLESwitch(TuyaBLEEntity, SwitchEntity):
                 return bool(datapoint.value)
         return False
 
-    def turn_on(self, **kwargs: Any) -> None:
+    async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
         if self._mapping.setter:
-            return self._mapping.setter(self, self._product, True)
+            return await self._mapping.setter(self, self._product, True)
 
         new_value: bool | bytes
         if self._mapping.bitmap_mask:
@@ -621,12 +635,12 @@ class TuyaBLESwitch(TuyaBLEEntity, SwitchEntity):
             )
             new_value = True
         if datapoint:
-            self._hass.create_task(datapoint.set_value(new_value))
+            await self._async_set_value(datapoint, new_value)
 
-    def turn_off(self, **kwargs: Any) -> None:
+    async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
         if self._mapping.setter:
-            return self._mapping.setter(self, self._product, False)
+            return await self._mapping.setter(self, self._product, False)
 
         new_value: bool | bytes
         if self._mapping.bitmap_mask:
@@ -648,7 +662,7 @@ class TuyaBLESwitch(TuyaBLEEntity, SwitchEntity):
             )
             new_value = False
         if datapoint:
-            self._hass.create_task(datapoint.set_value(new_value))
+            await self._async_set_value(datapoint, new_value)
 
     @property
     def available(self) -> bool:
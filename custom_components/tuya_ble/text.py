@@ -6,7 +6,7 @@ from dataclasses import dataclass
 
 import logging
 from struct import pack, unpack
-from typing import Callable
+from typing import Awaitable, Callable
 
 from homeassistant.components.text import (
     TextEntity,
@@ -21,7 +21,12 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from .const import (
     DOMAIN,
 )
-from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
+from .devices import (
+    TuyaBLEData,
+    TuyaBLEEntity,
+    TuyaBLEProductInfo,
+    get_mapping_dp_ids,
+)
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -73,7 +78,7 @@ def get_fingerbot_program(
     return result
 
 
-def set_fingerbot_program(
+async def set_fingerbot_program(
     self: TuyaBLEText,
     product: TuyaBLEProductInfo,
     value: str,
@@ -89,7 +94,7 @@ def set_fingerbot_program(
                 position = int(step_values[0])
                 delay = int(step_values[1]) if len(step_values) > 1 else 0
                 new_value += pack(">BH", position, delay)
-            self._hass.create_task(datapoint.set_value(new_value))
+            await self._async_set_value(datapoint, new_value)
 
 
 @dataclass
@@ -103,7 +108,7 @@ class TuyaBLETextMapping:
     default_value: str | None = None
     is_available: TuyaBLETextIsAvailable = None
     getter: Callable[[TuyaBLEText], None] | None = None
-    setter: Callable[[TuyaBLEText], None] | None = None
+    setter: Callable[[TuyaBLEText], Awaitable[None]] | None = None
 
 
 @dataclass
@@ -211,7 +216,14 @@ class TuyaBLEText(TuyaBLEEntity, TextEntity):
         product: TuyaBLEProductInfo,
         mapping: TuyaBLETextMapping,
     ) -> None:
-        super().__init__(hass, coordinator, device, product, mapping.description)
+        super().__init__(
+            hass,
+            coordinator,
+            device,
+            product,
+            mapping.description,
+            get_mapping_dp_ids(mapping),
+        )
         self._mapping = mapping
 
     @property
@@ -234,10 +246,10 @@ class TuyaBLEText(TuyaBLEEntity, TextEntity):
 
         return self._mapping.default_value
 
-    def set_value(self, value: str) -> None:
+    async def async_set_value(self, value: str) -> None:
         """Change the value."""
         if self._mapping.setter:
-            self._mapping.setter(self, self._product, value)
+            await self._mapping.setter(self, self._product, value)
             return
         datapoint = self._device.datapoints.get_or_create(
             self._mapping.dp_id,
@@ -245,7 +257,7 @@ class TuyaBLEText(TuyaBLEEntity, TextEntity):
             value,
         )
         if datapoint:
-            self._hass.create_task(datapoint.set_value(value))
+            await self._async_set_value(datapoint, value)
 
 
 async def async_setup_entry(
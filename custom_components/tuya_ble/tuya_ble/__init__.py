@@ -11,7 +11,12 @@ from .manager import (
     AbstaractTuyaBLEDeviceManager,
     TuyaBLEDeviceCredentials,
 )
-from .tuya_ble import TuyaBLEDataPoint, TuyaBLEDevice, TuyaBLEEntityDescription
+from .tuya_ble import (
+    TuyaBLEDataPoint,
+    TuyaBLEDevice,
+    TuyaBLEEntityDescription,
+    decode_advertised_ids,
+)
 
 
 __all__ = [
@@ -21,4 +26,5 @@ __all__ = [
     "TuyaBLEDevice",
     "TuyaBLEDeviceCredentials",
     "SERVICE_UUID",
+    "decode_advertised_ids",
 ]
@@ -0,0 +1,139 @@
+"""Encoding helpers shared by the Tuya BLE protocol implementation."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from struct import Struct
+from typing import Any
+
+from .const import TuyaBLEDataPointType
+
+CRC16_INIT = 0xFFFF
+CRC16_POLY = 0xA001  # CRC-16/MODBUS, reflected 0x8005
+
+
+def _build_crc16_table() -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 1:
+                crc = (crc >> 1) ^ CRC16_POLY
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+
+CRC16_TABLE = _build_crc16_table()
+
+
+def _calc_crc16_table(data: bytes) -> int:
+    crc = CRC16_INIT
+    table = CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+_calc_crc16_native: Callable[[bytes], int] | None = None
+try:
+    # Optional C implementation, used when the package happens to be installed.
+    # binascii only provides CRC-CCITT (crc_hqx), which is a different CRC.
+    from crcmod.crcmod import _usingExtension as _crcmod_native
+    from crcmod.predefined import mkPredefinedCrcFun
+
+    if _crcmod_native:
+        _calc_crc16_native = mkPredefinedCrcFun("modbus")
+except ImportError:
+    pass
+
+
+def calc_crc16(data: bytes | bytearray | memoryview) -> int:
+    """Calculate CRC-16/MODBUS checksum of the data."""
+    if _calc_crc16_native is not None:
+        return _calc_crc16_native(data)
+    return _calc_crc16_table(data)
+
+
+def decrypt_cbc(cipher: Any, iv: bytes, data: bytes) -> bytes:
+    """Decrypt AES-CBC data using a cipher in ECB mode.
+
+    Lets the caller keep the cipher, and so its expanded key, between
+    frames. All blocks are decrypted at once and chained with one XOR.
+    """
+    decrypted = cipher.decrypt(data)
+    chain = bytes(iv) + data[: len(data) - 16]
+    result = int.from_bytes(decrypted, "big") ^ int.from_bytes(chain, "big")
+    return result.to_bytes(len(decrypted), "big")
+
+
+INT8 = Struct(">b")
+INT16 = Struct(">h")
+INT32 = Struct(">i")
+UINT8 = Struct(">B")
+UINT16 = Struct(">H")
+UINT32 = Struct(">I")
+
+_SIGNED_INTS = {1: INT8.unpack, 2: INT16.unpack, 4: INT32.unpack}
+_BOOL_VALUES = (b"\x00", b"\x01")
+
+
+def _decode_raw(raw: bytes) -> bytes:
+    return raw
+
+
+def _decode_bool(raw: bytes) -> bool:
+    return any(raw)
+
+
+def _decode_int(raw: bytes) -> int:
+    unpack = _SIGNED_INTS.get(len(raw))
+    if unpack is not None:
+        return unpack(raw)[0]
+    return int.from_bytes(raw, "big", signed=True)
+
+
+def _decode_string(raw: bytes) -> str:
+    return raw.decode()
+
+
+def _encode_raw(value: bytes) -> bytes:
+    return value
+
+
+def _encode_bool(value: bool) -> bytes:
+    return _BOOL_VALUES[1 if value else 0]
+
+
+def _encode_enum(value: int) -> bytes:
+    if value > 0xFFFF:
+        return UINT32.pack(value)
+    if value > 0xFF:
+        return UINT16.pack(value)
+    return UINT8.pack(value)
+
+
+def _encode_string(value: str) -> bytes:
+    return value.encode()
+
+
+@dataclass(frozen=True)
+class DataPointCodec:
+    """Conversion of a datapoint type from and to its wire format."""
+
+    type: TuyaBLEDataPointType
+    decode: Callable[[bytes], Any]
+    encode: Callable[[Any], bytes]
+
+
+# Indexed by the type byte of a datapoint
+DATAPOINT_CODECS: tuple[DataPointCodec, ...] = (
+    DataPointCodec(TuyaBLEDataPointType.DT_RAW, _decode_raw, _encode_raw),
+    DataPointCodec(TuyaBLEDataPointType.DT_BOOL, _decode_bool, _encode_bool),
+    DataPointCodec(TuyaBLEDataPointType.DT_VALUE, _decode_int, INT32.pack),
+    DataPointCodec(TuyaBLEDataPointType.DT_STRING, _decode_string, _encode_string),
+    DataPointCodec(TuyaBLEDataPointType.DT_ENUM, _decode_int, _encode_enum),
+    DataPointCodec(TuyaBLEDataPointType.DT_BITMAP, _decode_raw, _encode_raw),
+)
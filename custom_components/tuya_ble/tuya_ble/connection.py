@@ -0,0 +1,377 @@
+"""Connection management helpers for Tuya BLE devices."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Any
+
+from bleak.backends.device import BLEDevice
+
+from .const import (
+    DEFAULT_MAX_CONCURRENT_CONNECTS,
+    LATENCY_BUCKETS,
+    RECONNECT_BACKOFF_INITIAL,
+    RECONNECT_BACKOFF_JITTER,
+    RECONNECT_BACKOFF_MAX,
+    RECONNECT_BACKOFF_MULTIPLIER,
+    RESPONSE_WAIT_TIMEOUT_INITIAL,
+    RESPONSE_WAIT_TIMEOUT_MAX,
+    RESPONSE_WAIT_TIMEOUT_MIN,
+    TuyaBLECode,
+)
+
+DEFAULT_CONNECTION_SOURCE = "default"
+
+
+class TuyaBLEConnectionState(Enum):
+    """States of the connection to a device."""
+
+    IDLE = "idle"
+    CONNECTING = "connecting"
+    PAIRING = "pairing"
+    READY = "ready"
+    BACKOFF = "backoff"
+
+
+class TuyaBLELatency(Enum):
+    """Phases of a request which durations are measured."""
+
+    CONNECT = "connect"
+    PAIRING = "pairing"
+    OPERATION_LOCK = "operation_lock"
+    GATT_WRITE = "gatt_write"
+    ACK_RTT = "ack_rtt"
+
+
+def get_connection_source(ble_device: BLEDevice) -> str:
+    """Get the adapter or proxy which is used to reach the device."""
+    details = ble_device.details
+    if isinstance(details, dict):
+        # Remote scanners (ESPHome proxies, etc.) report their source
+        source = details.get("source")
+        if source:
+            return str(source)
+        # BlueZ object path looks like /org/bluez/hci0/dev_XX_XX_XX_XX_XX_XX
+        path = details.get("path")
+        if isinstance(path, str):
+            parts = path.split("/")
+            if len(parts) > 3 and parts[3]:
+                return parts[3]
+    return DEFAULT_CONNECTION_SOURCE
+
+
+@dataclass
+class TuyaBLEConnectionWaitStats:
+    """Models time spent waiting for a connection slot."""
+
+    count: int = 0
+    total: float = 0.0
+    last: float = 0.0
+    max: float = 0.0
+
+    def add(self, wait_time: float) -> None:
+        self.count += 1
+        self.total += wait_time
+        self.last = wait_time
+        if wait_time > self.max:
+            self.max = wait_time
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "last": round(self.last, 3),
+            "mean": round(self.mean, 3),
+            "max": round(self.max, 3),
+        }
+
+
+@dataclass
+class TuyaBLEProtocolStats:
+    """Counters of connections, received frames and frames dropped by cause."""
+
+    connects: int = 0
+    unexpected_disconnects: int = 0
+    response_timeouts: int = 0
+    fragments_received: int = 0
+    frames_received: int = 0
+    # Frames dropped while being reassembled
+    unexpected_fragments: int = 0
+    missing_fragments: int = 0
+    oversized_frames: int = 0
+    # Reassembled frames which could not be parsed
+    crc_errors: int = 0
+    length_errors: int = 0
+    format_errors: int = 0
+    unknown_codes: int = 0
+
+    @property
+    def dropped_frames(self) -> dict[str, int]:
+        """Frames which were not processed, by cause."""
+        return {
+            "unexpected_fragment": self.unexpected_fragments,
+            "missing_fragment": self.missing_fragments,
+            "oversized": self.oversized_frames,
+            "crc": self.crc_errors,
+            "length": self.length_errors,
+            "format": self.format_errors,
+            "unknown_code": self.unknown_codes,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        result = asdict(self)
+        result["dropped_frames"] = sum(self.dropped_frames.values())
+        return result
+
+
+class TuyaBLELatencyHistogram:
+    """Durations counted in buckets with fixed upper bounds."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self._bounds = buckets
+        # The last bucket collects durations above the highest bound
+        self._counts = [0] * (len(buckets) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._last = 0.0
+        self._max = 0.0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def last(self) -> float:
+        return self._last
+
+    @property
+    def mean(self) -> float:
+        return self._total / self._count if self._count else 0.0
+
+    def add(self, duration: float) -> None:
+        self._counts[bisect.bisect_left(self._bounds, duration)] += 1
+        self._count += 1
+        self._total += duration
+        self._last = duration
+        if duration > self._max:
+            self._max = duration
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound of the bucket holding the percentile, at most the max."""
+        rank = self._count * percent / 100
+        seen = 0
+        for bound, count in zip(self._bounds, self._counts):
+            seen += count
+            if seen and seen >= rank:
+                return min(bound, self._max)
+        return self._max
+
+    def as_dict(self) -> dict[str, Any]:
+        buckets = {
+            str(bound): count for bound, count in zip(self._bounds, self._counts)
+        }
+        buckets["inf"] = self._counts[-1]
+        return {
+            "count": self._count,
+            "last": round(self._last, 3),
+            "mean": round(self.mean, 3),
+            "p50": round(self.percentile(50), 3),
+            "p95": round(self.percentile(95), 3),
+            "max": round(self._max, 3),
+            "buckets": buckets,
+        }
+
+
+class TuyaBLEReconnectPolicy:
+    """Exponential backoff with jitter between connection attempts."""
+
+    def __init__(
+        self,
+        initial_delay: float = RECONNECT_BACKOFF_INITIAL,
+        max_delay: float = RECONNECT_BACKOFF_MAX,
+        multiplier: float = RECONNECT_BACKOFF_MULTIPLIER,
+        jitter: float = RECONNECT_BACKOFF_JITTER,
+    ) -> None:
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._multiplier = multiplier
+        self._jitter = jitter
+        self._failures = 0
+        self._delay = 0.0
+        self._last_failure: float | None = None
+
+    @property
+    def failures(self) -> int:
+        """Failed attempts since the last successful connection."""
+        return self._failures
+
+    @property
+    def delay(self) -> float:
+        """Last delay returned by the policy."""
+        return self._delay
+
+    def next_delay(self) -> float:
+        """Register a failed attempt and get delay before the next one."""
+        delay = min(
+            self._max_delay,
+            # Exponent is capped, the delay is at maximum long before that
+            self._initial_delay * self._multiplier ** min(self._failures, 32),
+        )
+        delay *= 1 + random.uniform(-self._jitter, self._jitter)
+        self._failures += 1
+        self._delay = delay
+        self._last_failure = time.time()
+        return delay
+
+    def reset(self) -> None:
+        """Connection succeeded, start over with the initial delay."""
+        self._failures = 0
+        self._delay = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "failures": self._failures,
+            "delay": round(self._delay, 3),
+            "max_delay": self._max_delay,
+            "last_failure": self._last_failure,
+        }
+
+
+class TuyaBLERttEstimator:
+    """Response timeout based on smoothed round-trip time, as in RFC 6298."""
+
+    def __init__(
+        self,
+        initial_timeout: float = RESPONSE_WAIT_TIMEOUT_INITIAL,
+        min_timeout: float = RESPONSE_WAIT_TIMEOUT_MIN,
+        max_timeout: float = RESPONSE_WAIT_TIMEOUT_MAX,
+    ) -> None:
+        self._min_timeout = min_timeout
+        self._max_timeout = max_timeout
+        self._timeout = initial_timeout
+        self._srtt: float | None = None
+        self._rttvar = 0.0
+        self._samples = 0
+        self._timeouts = 0
+
+    @property
+    def timeout(self) -> float:
+        """Current timeout of a response."""
+        return self._timeout
+
+    def add_sample(self, rtt: float) -> None:
+        """Update the estimate with the round-trip time of a response."""
+        if self._srtt is None:
+            self._srtt = rtt
+            self._rttvar = rtt / 2
+        else:
+            self._rttvar = 0.75 * self._rttvar + 0.25 * abs(self._srtt - rtt)
+            self._srtt = 0.875 * self._srtt + 0.125 * rtt
+        self._samples += 1
+        self._timeout = min(
+            self._max_timeout,
+            max(self._min_timeout, self._srtt + 4 * self._rttvar),
+        )
+
+    def backoff(self) -> None:
+        """Response was lost, double the timeout."""
+        self._timeouts += 1
+        self._timeout = min(self._max_timeout, self._timeout * 2)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "srtt": round(self._srtt, 3) if self._srtt is not None else None,
+            "rttvar": round(self._rttvar, 3),
+            "timeout": round(self._timeout, 3),
+            "samples": self._samples,
+            "timeouts": self._timeouts,
+        }
+
+
+class TuyaBLEPacketTrace:
+    """Ring buffer with headers of the last frames sent and received."""
+
+    def __init__(self, size: int) -> None:
+        self._frames: deque[tuple[float, str, int, int, int, int]] | None = (
+            deque(maxlen=size) if size > 0 else None
+        )
+
+    def add(
+        self, direction: str, seq_num: int, response_to: int, code: int, length: int
+    ) -> None:
+        """Record a frame, payload is left out as it may contain keys."""
+        if self._frames is not None:
+            self._frames.append(
+                (time.time(), direction, seq_num, response_to, code, length)
+            )
+
+    def as_list(self) -> list[dict[str, Any]]:
+        result = []
+        for timestamp, direction, seq_num, response_to, code, length in (
+            self._frames or ()
+        ):
+            try:
+                code_name = TuyaBLECode(code).name
+            except ValueError:
+                code_name = hex(code)
+            result.append(
+                {
+                    "time": timestamp,
+                    "direction": direction,
+                    "seq_num": seq_num,
+                    "response_to": response_to,
+                    "code": code_name,
+                    "length": length,
+                }
+            )
+        return result
+
+
+class TuyaBLEConnectionScheduler:
+    """Limits concurrent connection attempts per Bluetooth adapter or proxy."""
+
+    def __init__(
+        self, max_concurrent_connects: int = DEFAULT_MAX_CONCURRENT_CONNECTS
+    ) -> None:
+        self._max_concurrent_connects = max(1, max_concurrent_connects)
+        self._slots: dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def max_concurrent_connects(self) -> int:
+        return self._max_concurrent_connects
+
+    @max_concurrent_connects.setter
+    def max_concurrent_connects(self, value: int) -> None:
+        """Change the limit, applies to the adapters seen afterwards."""
+        self._max_concurrent_connects = max(1, value)
+
+    def pending(self, source: str) -> bool:
+        """Check if all slots of the source are taken."""
+        slot = self._slots.get(source)
+        return slot is not None and slot.locked()
+
+    @asynccontextmanager
+    async def slot(self, ble_device: BLEDevice) -> AsyncIterator[float]:
+        """Hold a connection slot, yields the time spent waiting for it."""
+        source = get_connection_source(ble_device)
+        slot = self._slots.get(source)
+        if slot is None:
+            slot = asyncio.Semaphore(self._max_concurrent_connects)
+            self._slots[source] = slot
+        started = time.monotonic()
+        async with slot:
+            yield time.monotonic() - started
+
+
+connection_scheduler = TuyaBLEConnectionScheduler()
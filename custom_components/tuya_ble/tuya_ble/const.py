@@ -4,6 +4,9 @@ from enum import Enum
 
 GATT_MTU = 20
 
+# Security flag, IV and the encrypted header, 64K of data and CRC
+MAX_FRAME_LENGTH = 1 + 16 + 0x10010
+
 DEFAULT_ATTEMPTS = 0xFFFF
 
 CHARACTERISTIC_NOTIFY = "00002b10-0000-1000-8000-00805f9b34fb"
@@ -16,7 +19,48 @@ SERVICE_UUID_TEMP = "0000a201-0000-1000-8000-00805f9b34fb"
 
 MANUFACTURER_DATA_ID = 0x07D0
 
-RESPONSE_WAIT_TIMEOUT = 60
+# Seconds to wait for a response, adapted to the measured round-trip time
+RESPONSE_WAIT_TIMEOUT_INITIAL = 5.0
+RESPONSE_WAIT_TIMEOUT_MIN = 1.0
+RESPONSE_WAIT_TIMEOUT_MAX = 20.0
+
+# Seconds to wait for the device info and pairing responses, not adapted as
+# slow devices take long to answer them while the connection is set up
+RESPONSE_WAIT_TIMEOUT_CONNECT = 60.0
+
+# Times a request is sent again when no response is received
+RESPONSE_RETRIES = 2
+
+# Requests waiting for a response at once, further requests wait for a slot
+DEFAULT_INFLIGHT_WINDOW = 4
+
+# Seconds datapoint writes are collected to be sent in one frame, 0 disables
+DEFAULT_WRITE_COALESCE_DELAY = 0.03
+
+# Frames kept in the packet trace shown in diagnostics, 0 disables
+DEFAULT_PACKET_TRACE_SIZE = 32
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Seconds an on-demand connection is kept open after the last request
+DEFAULT_IDLE_DISCONNECT_DELAY = 30
+
+# Connection attempts running at once through one adapter or proxy
+DEFAULT_MAX_CONCURRENT_CONNECTS = 1
+
+# Backoff between failed connection attempts, in seconds
+RECONNECT_BACKOFF_INITIAL = 1.0
+RECONNECT_BACKOFF_MAX = 120.0
+RECONNECT_BACKOFF_MULTIPLIER = 2.0
+RECONNECT_BACKOFF_JITTER = 0.2
+
+# Seconds a request keeps trying to connect before it fails
+CONNECT_RETRY_TIMEOUT = 300.0
+
+# Seconds datapoints which failed to be written are kept to be sent again
+# after reconnecting, older ones are dropped
+RESEND_MAX_AGE = 60.0
 
 
 class TuyaBLECode(Enum):
@@ -6,9 +6,10 @@ import hashlib
 import logging
 import secrets
 import time
-from collections.abc import Callable, Hashable
+from collections.abc import Callable, Hashable, Mapping
 from struct import pack, unpack
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Any
 
 import json
@@ -31,12 +32,34 @@ from homeassistant.components.tuya.const import (
     DPType,
 )
 
+from .codec import DATAPOINT_CODECS, calc_crc16, decrypt_cbc
+from .connection import (
+    TuyaBLEConnectionScheduler,
+    TuyaBLEConnectionState,
+    TuyaBLEConnectionWaitStats,
+    TuyaBLELatency,
+    TuyaBLELatencyHistogram,
+    TuyaBLEPacketTrace,
+    TuyaBLEProtocolStats,
+    TuyaBLEReconnectPolicy,
+    TuyaBLERttEstimator,
+    connection_scheduler,
+    get_connection_source,
+)
 from .const import (
     CHARACTERISTIC_NOTIFY,
     CHARACTERISTIC_WRITE,
+    CONNECT_RETRY_TIMEOUT,
+    DEFAULT_IDLE_DISCONNECT_DELAY,
+    DEFAULT_INFLIGHT_WINDOW,
+    DEFAULT_PACKET_TRACE_SIZE,
+    DEFAULT_WRITE_COALESCE_DELAY,
     GATT_MTU,
     MANUFACTURER_DATA_ID,
-    RESPONSE_WAIT_TIMEOUT,
+    MAX_FRAME_LENGTH,
+    RESEND_MAX_AGE,
+    RESPONSE_RETRIES,
+    RESPONSE_WAIT_TIMEOUT_CONNECT,
     SERVICE_UUID_TEMP,
     TuyaBLECode,
     TuyaBLEDataPointType,
@@ -109,22 +132,7 @@ class TuyaBLEDataPoint:
         self._value = value
 
     def _get_value(self) -> bytes:
-        match self._type:
-            case TuyaBLEDataPointType.DT_RAW | TuyaBLEDataPointType.DT_BITMAP:
-                return self._value
-            case TuyaBLEDataPointType.DT_BOOL:
-                return pack(">B", 1 if self._value else 0)
-            case TuyaBLEDataPointType.DT_VALUE:
-                return pack(">i", self._value)
-            case TuyaBLEDataPointType.DT_ENUM:
-                if self._value > 0xFFFF:
-                    return pack(">I", self._value)
-                if self._value > 0xFF:
-                    return pack(">H", self._value)
-
-                return pack(">B", self._value)
-            case TuyaBLEDataPointType.DT_STRING:
-                return self._value.encode()
+        return DATAPOINT_CODECS[self._type.value].encode(self._value)
 
     @property
     def id(self) -> int:
@@ -183,6 +191,8 @@ class TuyaBLEDataPoints:
         self._datapoints: dict[int, TuyaBLEDataPoint] = {}
         self._update_started: int = 0
         self._updated_datapoints: list[int] = []
+        self._pending_write: asyncio.Future[None] | None = None
+        self._pending_write_timer: asyncio.TimerHandle | None = None
         self._last_data_received: datetime | None = None
 
     def __len__(self) -> int:
@@ -216,6 +226,7 @@ class TuyaBLEDataPoints:
             return datapoint
         datapoint = TuyaBLEDataPoint(self, id, time.time(), 0, type, value)
         self._datapoints[id] = datapoint
+        self._owner._update_status(datapoint)
         return datapoint
 
     def begin_update(self) -> None:
@@ -225,8 +236,44 @@ class TuyaBLEDataPoints:
         if self._update_started > 0:
             self._update_started -= 1
             if self._update_started == 0 and len(self._updated_datapoints) > 0:
-                await self._owner._send_datapoints(self._updated_datapoints)
-                self._updated_datapoints = []
+                await self._send_updated()
+
+    async def _send_updated(self) -> None:
+        if self._pending_write_timer:
+            self._pending_write_timer.cancel()
+            self._pending_write_timer = None
+        future = self._pending_write
+        self._pending_write = None
+        datapoints = self._updated_datapoints
+        self._updated_datapoints = []
+        try:
+            if len(datapoints) > 0:
+                await self._owner._send_datapoints(datapoints)
+        except Exception as ex:
+            if future and not future.done():
+                future.set_exception(ex)
+            raise
+        if future and not future.done():
+            future.set_result(None)
+
+    @staticmethod
+    def _retrieve_write_exception(future: asyncio.Future) -> None:
+        if not future.cancelled():
+            future.exception()
+
+    def _pending_write_expired(self) -> None:
+        self._pending_write_timer = None
+        if self._update_started > 0:
+            # end_update() sends the collected datapoints
+            return
+        asyncio.create_task(self._send_pending_write())
+
+    async def _send_pending_write(self) -> None:
+        try:
+            await self._send_updated()
+        except Exception:
+            # Reported to the writers waiting for the pending write
+            pass
 
     def _update_from_device(
         self,
@@ -241,20 +288,34 @@ class TuyaBLEDataPoints:
         if dp:
             dp._update_from_device(timestamp, flags, type, value)
         else:
-            self._datapoints[dp_id] = TuyaBLEDataPoint(
-                self, dp_id, timestamp, flags, type, value
-            )
+            dp = TuyaBLEDataPoint(self, dp_id, timestamp, flags, type, value)
+            self._datapoints[dp_id] = dp
+        self._owner._update_status(dp)
 
     async def _update_from_user(self, dp_id: int) -> None:
-        if self._update_started > 0:
+        self._owner._update_status(self._datapoints[dp_id])
+        delay = self._owner.write_coalesce_delay
+        if self._update_started > 0 or delay > 0:
             if dp_id in self._updated_datapoints:
                 self._updated_datapoints.remove(dp_id)
             self._updated_datapoints.append(dp_id)
-        else:
+        if self._update_started > 0:
+            return
+        if delay <= 0:
             await self._owner._send_datapoints([dp_id])
-
-
-global_connect_lock = asyncio.Lock()
+            return
+        # Writes made within the delay are sent in one frame, each datapoint
+        # is sent once with its latest value
+        if self._pending_write is None:
+            loop = asyncio.get_running_loop()
+            self._pending_write = loop.create_future()
+            # Writers may be cancelled while waiting, the failure is not
+            # reported as never retrieved then
+            self._pending_write.add_done_callback(self._retrieve_write_exception)
+            self._pending_write_timer = loop.call_later(
+                delay, self._pending_write_expired
+            )
+        await asyncio.shield(self._pending_write)
 
 
 @dataclass
@@ -274,6 +335,36 @@ class TuyaBLEDeviceFunction:
         super().__setattr__(name, value)
 
 
+def decode_advertised_ids(
+    service_data: dict[str, bytes] | None,
+    manufacturer_data: dict[int, bytes] | None,
+) -> tuple[str | None, str | None]:
+    """Get product id and uuid of a device from its advertisement."""
+    raw_product_id: bytes | None = None
+    # raw_product_key: bytes | None = None
+    product_id: str | None = None
+    uuid: str | None = None
+    if service_data:
+        data = service_data.get(SERVICE_UUID_TEMP)
+        if data and len(data) > 1:
+            match data[0]:
+                case 0:
+                    raw_product_id = data[1:]
+                    product_id = raw_product_id.decode("utf-8", "replace")
+                # case 1:
+                #    raw_product_key = data[1:]
+
+    if manufacturer_data and raw_product_id:
+        data = manufacturer_data.get(MANUFACTURER_DATA_ID)
+        # Encrypted uuid takes one AES block
+        if data and len(data) >= 22:
+            key = hashlib.md5(raw_product_id).digest()
+            cipher = AES.new(key, AES.MODE_CBC, key)
+            uuid = cipher.decrypt(data[6:22]).decode("utf-8", "replace")
+
+    return (product_id, uuid)
+
+
 class TuyaBLEDevice:
     """Abstract model of a device"""
 
@@ -282,6 +373,12 @@ class TuyaBLEDevice:
         device_manager: AbstaractTuyaBLEDeviceManager,
         ble_device: BLEDevice,
         advertisement_data: AdvertisementData | None = None,
+        scheduler: TuyaBLEConnectionScheduler | None = None,
+        on_demand: bool = False,
+        idle_disconnect_delay: float = DEFAULT_IDLE_DISCONNECT_DELAY,
+        inflight_window: int = DEFAULT_INFLIGHT_WINDOW,
+        write_coalesce_delay: float = DEFAULT_WRITE_COALESCE_DELAY,
+        packet_trace_size: int = DEFAULT_PACKET_TRACE_SIZE,
     ) -> None:
         """Init the TuyaBLE."""
         self._device_manager = device_manager
@@ -289,13 +386,35 @@ class TuyaBLEDevice:
         self._ble_device = ble_device
         self._advertisement_data = advertisement_data
         self._operation_lock = asyncio.Lock()
+        self._inflight_window = max(1, inflight_window)
+        self._inflight = asyncio.Semaphore(self._inflight_window)
         self._connect_lock = asyncio.Lock()
+        self._connection_scheduler = scheduler or connection_scheduler
+        self._connect_wait_stats = TuyaBLEConnectionWaitStats()
+        self._reconnect_policy = TuyaBLEReconnectPolicy()
+        self._state = TuyaBLEConnectionState.IDLE
+        self._supervisor: asyncio.Task | None = None
+        self._reconnect_requested = asyncio.Event()
+        # Datapoints which failed to be sent, sent again after reconnecting
+        # Datapoints which failed to be written, by the time they failed
+        self._pending_datapoints: dict[int, float] = {}
+        self._rtt_estimators: dict[TuyaBLECode, TuyaBLERttEstimator] = {}
+        self._latency = {metric: TuyaBLELatencyHistogram() for metric in TuyaBLELatency}
         self._client: BleakClientWithServiceCache | None = None
         self._expected_disconnect = False
+        # Set on stop, interrupts the backoff between connection attempts
+        self._stopping = asyncio.Event()
+        self._on_demand = on_demand
+        self._idle_disconnect_delay = idle_disconnect_delay
+        self._write_coalesce_delay = write_coalesce_delay
+        self._packet_trace = TuyaBLEPacketTrace(packet_trace_size)
+        self._protocol_stats = TuyaBLEProtocolStats()
+        self._disconnect_timer: asyncio.TimerHandle | None = None
         self._connected_callbacks: list[Callable[[], None]] = []
         self._callbacks: list[Callable[[list[TuyaBLEDataPoint]], None]] = []
         self._disconnected_callbacks: list[Callable[[], None]] = []
         self._current_seq_num = 1
+        self._current_dp_seq_num = 1
         self._seq_num_lock = asyncio.Lock()
 
         self._is_bound = False
@@ -312,10 +431,14 @@ class TuyaBLEDevice:
         self._local_key: bytes | None = None
         self._login_key: bytes | None = None
         self._session_key: bytes | None = None
+        # Ciphers in ECB mode by security flag, reset when the keys change
+        self._ciphers: dict[int, Any] = {}
 
         self._is_paired = False
 
         self._input_buffer: bytearray | None = None
+        self._input_view: memoryview | None = None
+        self._input_length = 0
         self._input_expected_packet_num = 0
         self._input_expected_length = 0
         self._input_expected_responses: dict[int, asyncio.Future[int] | None] = {}
@@ -325,6 +448,10 @@ class TuyaBLEDevice:
 
         self._function = {}
         self._status_range = {}
+        # Values of the known codes, kept up to date as datapoints change
+        self._status: dict[str, Any] = {}
+        self._status_view = MappingProxyType(self._status)
+        self._status_codes: dict[int, list[str]] = {}
 
     def set_ble_device_and_advertisement_data(
         self, ble_device: BLEDevice, advertisement_data: AdvertisementData
@@ -372,6 +499,7 @@ class TuyaBLEDevice:
             if self._device_info:
                 self._local_key = self._device_info.local_key[:6].encode()
                 self._login_key = hashlib.md5(self._local_key).digest()
+                self._ciphers.clear()
 
                 self.append_functions(
                     self._device_info.functions, self._device_info.status_range
@@ -389,6 +517,28 @@ class TuyaBLEDevice:
                 dpcode = f.get("code")
                 if dpcode:
                     self.status_range[dpcode] = TuyaBLEDeviceFunction(**f)
+        self._rebuild_status()
+
+    def _rebuild_status(self) -> None:
+        self._status.clear()
+        self._status_codes.clear()
+        dps = self.datapoints._datapoints
+        for functions in [self.status_range, self.function]:
+            for dpcode, f in functions.items():
+                codes = self._status_codes.setdefault(f.dp_id, [])
+                if dpcode not in codes:
+                    codes.append(dpcode)
+                if dp := dps.get(f.dp_id):
+                    self._status[dpcode] = dp.value
+
+    def _update_status(self, datapoint: TuyaBLEDataPoint) -> None:
+        dp_id = datapoint.id
+        for dpcode in self._status_codes.get(dp_id, ()):
+            f = self.function.get(dpcode)
+            if f and f.dp_id != dp_id and f.dp_id in self.datapoints._datapoints:
+                # Datapoint of the function takes precedence
+                continue
+            self._status[dpcode] = datapoint.value
 
     def update_description(self, description: TuyaBLEEntityDescription | None) -> None:
         if not description:
@@ -414,21 +564,7 @@ class TuyaBLEDevice:
                     f.values = values
 
     def _decode_advertisement_data(self) -> None:
-        raw_product_id: bytes | None = None
-        # raw_product_key: bytes | None = None
-        raw_uuid: bytes | None = None
         if self._advertisement_data:
-            if self._advertisement_data.service_data:
-                service_data = self._advertisement_data.service_data.get(
-                    SERVICE_UUID_TEMP
-                )
-                if service_data and len(service_data) > 1:
-                    match service_data[0]:
-                        case 0:
-                            raw_product_id = service_data[1:]
-                        # case 1:
-                        #    raw_product_key = service_data[1:]
-
             if self._advertisement_data.manufacturer_data:
                 manufacturer_data = self._advertisement_data.manufacturer_data.get(
                     MANUFACTURER_DATA_ID
@@ -436,12 +572,12 @@ class TuyaBLEDevice:
                 if manufacturer_data and len(manufacturer_data) > 6:
                     self._is_bound = (manufacturer_data[0] & 0x80) != 0
                     self._protocol_version = manufacturer_data[1]
-                    raw_uuid = manufacturer_data[6:]
-                    if raw_product_id:
-                        key = hashlib.md5(raw_product_id).digest()
-                        cipher = AES.new(key, AES.MODE_CBC, key)
-                        raw_uuid = cipher.decrypt(raw_uuid)
-                        self._uuid = raw_uuid.decode("utf-8")
+            _, uuid = decode_advertised_ids(
+                self._advertisement_data.service_data,
+                self._advertisement_data.manufacturer_data,
+            )
+            if uuid is not None:
+                self._uuid = uuid
 
     @property
     def address(self) -> str:
@@ -536,27 +672,70 @@ class TuyaBLEDevice:
     def protocol_version(self) -> str:
         return self._protocol_version_str
 
+    @property
+    def on_demand(self) -> bool:
+        """Connection is opened only for requests and closed when idle."""
+        return self._on_demand
+
+    @property
+    def write_coalesce_delay(self) -> float:
+        """Seconds datapoint writes are collected before they are sent."""
+        return self._write_coalesce_delay
+
+    @property
+    def connect_wait_stats(self) -> TuyaBLEConnectionWaitStats:
+        """Time spent waiting for a connection slot."""
+        return self._connect_wait_stats
+
+    @property
+    def connection_state(self) -> TuyaBLEConnectionState:
+        """Current state of the connection."""
+        return self._state
+
+    @property
+    def inflight_window(self) -> int:
+        """Maximum number of requests waiting for a response."""
+        return self._inflight_window
+
+    @property
+    def packet_trace(self) -> TuyaBLEPacketTrace:
+        """Headers of the last frames sent and received."""
+        return self._packet_trace
+
+    @property
+    def ble_device(self) -> BLEDevice:
+        """Bluetooth device used for the connection."""
+        return self._ble_device
+
+    @property
+    def protocol_stats(self) -> TuyaBLEProtocolStats:
+        """Counters of connections and errors of received frames."""
+        return self._protocol_stats
+
+    @property
+    def rtt_estimators(self) -> dict[TuyaBLECode, TuyaBLERttEstimator]:
+        """Round-trip time estimates by command code."""
+        return self._rtt_estimators
+
+    @property
+    def latency(self) -> dict[TuyaBLELatency, TuyaBLELatencyHistogram]:
+        """Durations of connecting, pairing and sending requests."""
+        return self._latency
+
+    @property
+    def reconnect_policy(self) -> TuyaBLEReconnectPolicy:
+        """Backoff state of the connection attempts."""
+        return self._reconnect_policy
+
     @property
     def datapoints(self) -> TuyaBLEDataPoints:
         """Get datapoints exposed by device."""
         return self._datapoints
 
     @property
-    def status(self) -> dict[str, Any]:
-        """Get current datapoints values."""
-
-        result = {}
-        dps = self.datapoints._datapoints
-        if dps:
-            order = [self.status_range, self.function]
-            for functions in order:
-                for dpcode in functions:
-                    f = functions[dpcode]
-                    dpid = f.dp_id
-                    v = dps.get(dpid)
-                    if v:
-                        result[dpcode] = v.value
-        return result
+    def status(self) -> Mapping[str, Any]:
+        """Get current datapoints values, read-only and updated in place."""
+        return self._status_view
 
     def datapoint_log_payload(self) -> dict[Hashable, Any]:
         """Creates a dict of printable values"""
@@ -574,6 +753,31 @@ class TuyaBLEDevice:
         """Last data received"""
         return self._datapoints.last_data_received
 
+    def get_diagnostics(self) -> dict[str, Any]:
+        """Snapshot of the protocol state, taken without waiting for locks."""
+        last_data_received = self.last_data_received
+        datapoints = {
+            key: value.hex() if isinstance(value, (bytes, bytearray)) else value
+            for key, value in self.datapoint_log_payload().items()
+        }
+        return {
+            "datapoints": datapoints,
+            "last_data_received": (
+                last_data_received.isoformat() if last_data_received else None
+            ),
+            "device_version": self._device_version,
+            "protocol_version": self._protocol_version_str,
+            "hardware_version": self._hardware_version,
+            "is_bound": self._is_bound,
+            "is_paired": self._is_paired,
+            "flags": self._flags,
+            "seq_num": self._current_seq_num,
+            "dp_seq_num": self._current_dp_seq_num,
+            "expected_responses": sorted(self._input_expected_responses),
+            "operation_locked": self._operation_lock.locked(),
+            "protocol_stats": self._protocol_stats.as_dict(),
+        }
+
     def get_or_create_datapoint(
         self,
         id: int,
@@ -639,12 +843,33 @@ class TuyaBLEDevice:
     async def stop(self) -> None:
         """Stop the TuyaBLE."""
         _LOGGER.debug("%s: Stop", self.address)
+        self._cancel_disconnect_timer()
+        self._expected_disconnect = True
+        self._stopping.set()
+        if self._supervisor:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
         await self._execute_disconnect()
 
     def _disconnected(self, client: BleakClientWithServiceCache) -> None:
         """Disconnected callback."""
         was_paired = self._is_paired
         self._is_paired = False
+        self._state = TuyaBLEConnectionState.IDLE
+        if self._on_demand and not self._expected_disconnect:
+            # Next request opens the connection again
+            self._client = None
+            _LOGGER.debug(
+                "%s: Disconnected from on-demand device; RSSI: %s",
+                self.address,
+                self.rssi,
+            )
+            self._fire_disconnected_callbacks()
+            return
         if self._expected_disconnect:
             _LOGGER.debug(
                 "%s: Disconnected from device; RSSI: %s",
@@ -654,6 +879,7 @@ class TuyaBLEDevice:
             self._fire_disconnected_callbacks()
             return
         self._client = None
+        self._protocol_stats.unexpected_disconnects += 1
         _LOGGER.warning(
             "%s: Device unexpectedly disconnected; RSSI: %s",
             self.address,
@@ -665,19 +891,53 @@ class TuyaBLEDevice:
                 self.address,
                 self.rssi,
             )
-            asyncio.create_task(self._reconnect())
+            self._request_reconnect()
+
+    def _schedule_disconnect(self) -> None:
+        """Restart the idle timer of the on-demand connection."""
+        if not self._on_demand:
+            return
+        self._cancel_disconnect_timer()
+        self._disconnect_timer = asyncio.get_running_loop().call_later(
+            self._idle_disconnect_delay, self._disconnect
+        )
+
+    def _cancel_disconnect_timer(self) -> None:
+        if self._disconnect_timer:
+            self._disconnect_timer.cancel()
+            self._disconnect_timer = None
 
     def _disconnect(self) -> None:
         """Disconnect from device."""
+        self._disconnect_timer = None
         asyncio.create_task(self._execute_timed_disconnect())
 
     async def _execute_timed_disconnect(self) -> None:
         """Execute timed disconnection."""
+        if self._operation_lock.locked() or self._input_expected_responses:
+            # Still busy, wait for another idle period
+            self._schedule_disconnect()
+            return
         _LOGGER.debug(
-            "%s: Disconnecting",
+            "%s: Disconnecting after %ss of inactivity",
             self.address,
+            self._idle_disconnect_delay,
         )
-        await self._execute_disconnect()
+        async with self._connect_lock:
+            client = self._client
+            self._client = None
+            self._is_paired = False
+            self._state = TuyaBLEConnectionState.IDLE
+            if client and client.is_connected:
+                try:
+                    await client.stop_notify(CHARACTERISTIC_NOTIFY)
+                    await client.disconnect()
+                except BLEAK_EXCEPTIONS:
+                    _LOGGER.debug(
+                        "%s: Disconnecting failed", self.address, exc_info=True
+                    )
+        async with self._seq_num_lock:
+            self._current_seq_num = 1
 
     async def _execute_disconnect(self) -> None:
         """Execute disconnection."""
@@ -685,6 +945,7 @@ class TuyaBLEDevice:
             client = self._client
             self._expected_disconnect = True
             self._client = None
+            self._state = TuyaBLEConnectionState.IDLE
             if client and client.is_connected:
                 await client.stop_notify(CHARACTERISTIC_NOTIFY)
                 await client.disconnect()
@@ -693,7 +954,6 @@ class TuyaBLEDevice:
 
     async def _ensure_connected(self) -> None:
         """Ensure connection to device is established."""
-        global global_connect_lock
         if self._expected_disconnect:
             return
         if self._connect_lock.locked():
@@ -711,20 +971,46 @@ class TuyaBLEDevice:
             if self._client and self._client.is_connected and self._is_paired:
                 return
             attempts_count = 100
+            deadline = time.monotonic() + CONNECT_RETRY_TIMEOUT
+            retry = False
             while attempts_count > 0:
                 attempts_count -= 1
-                if attempts_count == 0:
+                if attempts_count == 0 or time.monotonic() > deadline:
                     _LOGGER.error(
                         "%s: Connecting, all attempts failed; RSSI: %s",
                         self.address,
                         self.rssi,
                     )
+                    self._state = TuyaBLEConnectionState.IDLE
                     raise BleakNotFoundError()
+                if retry:
+                    await self._backoff()
+                    if self._expected_disconnect:
+                        # Stopped while backing off, release the lock for it
+                        self._state = TuyaBLEConnectionState.IDLE
+                        return
+                retry = True
+                self._state = TuyaBLEConnectionState.CONNECTING
                 try:
-                    async with global_connect_lock:
+                    source = get_connection_source(self._ble_device)
+                    if self._connection_scheduler.pending(source):
+                        _LOGGER.debug(
+                            "%s: Waiting for connection slot of %s",
+                            self.address,
+                            source,
+                        )
+                    async with self._connection_scheduler.slot(
+                        self._ble_device
+                    ) as wait_time:
+                        self._connect_wait_stats.add(wait_time)
                         _LOGGER.debug(
-                            "%s: Connecting; RSSI: %s", self.address, self.rssi
+                            "%s: Connecting via %s after %.3fs in queue; RSSI: %s",
+                            self.address,
+                            source,
+                            wait_time,
+                            self.rssi,
                         )
+                        started = time.monotonic()
                         client = await establish_connection(
                             BleakClientWithServiceCache,
                             self._ble_device,
@@ -733,6 +1019,9 @@ class TuyaBLEDevice:
                             use_services_cache=True,
                             ble_device_callback=lambda: self._ble_device,
                         )
+                        self._latency[TuyaBLELatency.CONNECT].add(
+                            time.monotonic() - started
+                        )
                 except BleakNotFoundError:
                     _LOGGER.error(
                         "%s: device not found, not in range, or poor RSSI: %s",
@@ -769,6 +1058,8 @@ class TuyaBLEDevice:
                     continue
 
                 if self._client and self._client.is_connected:
+                    self._state = TuyaBLEConnectionState.PAIRING
+                    pairing_started = time.monotonic()
                     _LOGGER.debug("%s: Sending device info request", self.address)
                     try:
                         if not await self._send_packet_while_connected(
@@ -820,53 +1111,121 @@ class TuyaBLEDevice:
                 else:
                     continue
 
+                self._latency[TuyaBLELatency.PAIRING].add(
+                    time.monotonic() - pairing_started
+                )
                 break
 
         if self._client:
             if self._client.is_connected:
                 if self._is_paired:
                     _LOGGER.debug("%s: Successfully connected", self.address)
+                    self._reconnect_policy.reset()
+                    self._protocol_stats.connects += 1
+                    self._state = TuyaBLEConnectionState.READY
                     self._fire_connected_callbacks()
-                else:
-                    _LOGGER.error("%s: Connected but not paired", self.address)
+                    return
+                _LOGGER.error("%s: Connected but not paired", self.address)
             else:
                 _LOGGER.error("%s: Not connected", self.address)
         else:
             _LOGGER.error("%s: No client device", self.address)
+        self._state = TuyaBLEConnectionState.IDLE
 
-    async def _reconnect(self) -> None:
-        """Attempt a reconnect"""
-        _LOGGER.debug("%s: Reconnect, ensuring connection", self.address)
-        async with self._seq_num_lock:
-            self._current_seq_num = 1
-        try:
+    def _request_reconnect(self, datapoint_ids: list[int] | None = None) -> None:
+        """Ask the supervisor to restore the connection.
+
+        Requests made while a reconnect is pending are merged into it.
+        """
+        if self._expected_disconnect or self._on_demand:
+            return
+        if datapoint_ids:
+            # Frames are encrypted with the key of the session, so the
+            # datapoints are encoded again once paired in the new session
+            failed = time.monotonic()
+            for dp_id in datapoint_ids:
+                self._pending_datapoints.setdefault(dp_id, failed)
+        self._reconnect_requested.set()
+        if self._supervisor is None or self._supervisor.done():
+            self._supervisor = asyncio.create_task(self._supervise())
+
+    async def _supervise(self) -> None:
+        """Restore the connection whenever it is requested, one at a time."""
+        while not self._expected_disconnect:
+            await self._reconnect_requested.wait()
+            self._reconnect_requested.clear()
             if self._expected_disconnect:
-                return
-            await self._ensure_connected()
+                break
+            _LOGGER.debug("%s: Reconnect, ensuring connection", self.address)
+            if not self._is_paired:
+                async with self._seq_num_lock:
+                    self._current_seq_num = 1
+            self._state = TuyaBLEConnectionState.CONNECTING
+            try:
+                await self._ensure_connected()
+            except BLEAK_EXCEPTIONS:
+                _LOGGER.debug(
+                    "%s: Reconnect, failed to ensure connection",
+                    self.address,
+                    exc_info=True,
+                )
+            except Exception:
+                _LOGGER.error(
+                    "%s: Reconnect, unexpected error", self.address, exc_info=True
+                )
             if self._expected_disconnect:
-                return
+                break
+            if not self._is_paired:
+                _LOGGER.debug("%s: Reconnect failed - backing off", self.address)
+                await self._backoff()
+                self._reconnect_requested.set()
+                continue
             _LOGGER.debug("%s: Reconnect, connection ensured", self.address)
-        except BLEAK_EXCEPTIONS:  # BleakNotFoundError:
+            await self._resend_pending()
+
+    async def _resend_pending(self) -> None:
+        oldest = time.monotonic() - RESEND_MAX_AGE
+        pending = [
+            dp_id
+            for dp_id, failed in self._pending_datapoints.items()
+            if failed >= oldest
+        ]
+        if len(pending) < len(self._pending_datapoints):
             _LOGGER.debug(
-                "%s: Reconnect, failed to ensure connection - backing off",
+                "%s: Dropping datapoints not sent for %ss",
                 self.address,
-                exc_info=True,
+                RESEND_MAX_AGE,
             )
-            await asyncio.sleep(BLEAK_BACKOFF_TIME)
-            _LOGGER.debug("%s: Reconnecting again", self.address)
-            asyncio.create_task(self._reconnect())
+        self._pending_datapoints = {}
+        if not pending:
+            return
+        _LOGGER.debug("%s: Resending datapoints %s", self.address, pending)
+        try:
+            # Current values are sent, encrypted with the new session key
+            await self._send_datapoints(pending)
+        except (*BLEAK_EXCEPTIONS, TuyaBLEError):
+            _LOGGER.debug(
+                "%s: Resending datapoints failed", self.address, exc_info=True
+            )
+
+    async def _backoff(self) -> None:
+        """Wait before the next connection attempt."""
+        self._state = TuyaBLEConnectionState.BACKOFF
+        delay = self._reconnect_policy.next_delay()
+        _LOGGER.debug(
+            "%s: Backing off %.2fs after %s failed attempts",
+            self.address,
+            delay,
+            self._reconnect_policy.failures,
+        )
+        try:
+            await asyncio.wait_for(self._stopping.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
 
     @staticmethod
     def _calc_crc16(data: bytes) -> int:
-        crc = 0xFFFF
-        for byte in data:
-            crc ^= byte & 255
-            for _ in range(8):
-                tmp = crc & 1
-                crc >>= 1
-                if tmp != 0:
-                    crc ^= 0xA001
-        return crc
+        return calc_crc16(data)
 
     @staticmethod
     def _pack_int(value: int) -> bytearray:
@@ -917,6 +1276,7 @@ class TuyaBLEDevice:
             key = self._session_key
             security_flag = b"\x05"
 
+        self._packet_trace.add("tx", seq_num, response_to, code.value, len(data))
         raw = bytearray()
         raw += pack(">IIHH", seq_num, response_to, code.value, len(data))
         raw += data
@@ -951,6 +1311,11 @@ class TuyaBLEDevice:
 
         return command
 
+    def _get_dp_seq_num(self) -> int:
+        result = self._current_dp_seq_num
+        self._current_dp_seq_num = (result + 1) & 0xFFFFFFFF
+        return result
+
     async def _get_seq_num(self) -> int:
         async with self._seq_num_lock:
             result = self._current_seq_num
@@ -970,7 +1335,23 @@ class TuyaBLEDevice:
         await self._ensure_connected()
         if self._expected_disconnect:
             return
-        await self._send_packet_while_connected(code, data, 0, wait_for_response)
+        try:
+            if wait_for_response:
+                # Requests are pipelined, acknowledgements are matched to them
+                # by sequence number; only the number of pending ones is bound
+                if self._inflight.locked():
+                    _LOGGER.debug(
+                        "%s: %s requests in flight, waiting to send %s",
+                        self.address,
+                        self._inflight_window,
+                        code.name,
+                    )
+                async with self._inflight:
+                    await self._send_packet_while_connected(code, data, 0, True)
+            else:
+                await self._send_packet_while_connected(code, data, 0, False)
+        finally:
+            self._schedule_disconnect()
 
     async def _send_response(
         self,
@@ -991,43 +1372,81 @@ class TuyaBLEDevice:
         # retry: int | None = None
     ) -> bool:
         """Send packet to device and optional read response."""
-        result = True
-        future: asyncio.Future | None = None
-        seq_num = await self._get_seq_num()
+        estimator: TuyaBLERttEstimator | None = None
         if wait_for_response:
-            future = asyncio.Future()
-            self._input_expected_responses[seq_num] = future
+            estimator = self._rtt_estimators.get(code)
+            if estimator is None:
+                if code in (
+                    TuyaBLECode.FUN_SENDER_DEVICE_INFO,
+                    TuyaBLECode.FUN_SENDER_PAIR,
+                ):
+                    estimator = TuyaBLERttEstimator(
+                        RESPONSE_WAIT_TIMEOUT_CONNECT,
+                        RESPONSE_WAIT_TIMEOUT_CONNECT,
+                        RESPONSE_WAIT_TIMEOUT_CONNECT,
+                    )
+                else:
+                    estimator = TuyaBLERttEstimator()
+                self._rtt_estimators[code] = estimator
 
-        if response_to > 0:
-            _LOGGER.debug(
-                "%s: Sending packet: #%s %s in response to #%s",
-                self.address,
-                seq_num,
-                code.name,
-                response_to,
-            )
-        else:
-            _LOGGER.debug(
-                "%s: Sending packet: #%s %s",
-                self.address,
-                seq_num,
-                code.name,
-            )
-        packets: list[bytes] = self._build_packets(seq_num, code, data, response_to)
-        await self._int_send_packet_while_connected(packets)
-        if future:
-            try:
-                await asyncio.wait_for(future, RESPONSE_WAIT_TIMEOUT)
-            except asyncio.TimeoutError:
-                _LOGGER.error(
-                    "%s: timeout receiving response, RSSI: %s",
+        for attempt in range(RESPONSE_RETRIES + 1):
+            future: asyncio.Future | None = None
+            seq_num = await self._get_seq_num()
+            if wait_for_response:
+                future = asyncio.Future()
+                self._input_expected_responses[seq_num] = future
+
+            if response_to > 0:
+                _LOGGER.debug(
+                    "%s: Sending packet: #%s %s in response to #%s",
                     self.address,
-                    self.rssi,
+                    seq_num,
+                    code.name,
+                    response_to,
                 )
-                result = False
-            self._input_expected_responses.pop(seq_num, None)
-
-        return result
+            else:
+                _LOGGER.debug(
+                    "%s: Sending packet: #%s %s",
+                    self.address,
+                    seq_num,
+                    code.name,
+                )
+            packets: list[bytes] = self._build_packets(seq_num, code, data, response_to)
+            try:
+                await self._int_send_packet_while_connected(packets)
+                if not future:
+                    return True
+                sent = time.monotonic()
+                try:
+                    await asyncio.wait_for(future, estimator.timeout)
+                except asyncio.TimeoutError:
+                    estimator.backoff()
+                    self._protocol_stats.response_timeouts += 1
+                    _LOGGER.debug(
+                        "%s: timeout receiving response to #%s %s, RSSI: %s",
+                        self.address,
+                        seq_num,
+                        code.name,
+                        self.rssi,
+                    )
+                    continue
+            finally:
+                self._input_expected_responses.pop(seq_num, None)
+
+            # Only responses to the first transmission are unambiguous
+            if attempt == 0:
+                rtt = time.monotonic() - sent
+                estimator.add_sample(rtt)
+                self._latency[TuyaBLELatency.ACK_RTT].add(rtt)
+            return True
+
+        _LOGGER.error(
+            "%s: timeout receiving response to %s, RSSI: %s",
+            self.address,
+            code.name,
+            self.rssi,
+        )
+        return False
 
     async def _int_send_packet_while_connected(
         self,
@@ -1040,7 +1459,9 @@ class TuyaBLEDevice:
                 self.address,
                 self.rssi,
             )
+        started = time.monotonic()
         async with self._operation_lock:
+            self._latency[TuyaBLELatency.OPERATION_LOCK].add(time.monotonic() - started)
             try:
                 await self._send_packets_locked(packets)
             except BleakNotFoundError:
@@ -1059,14 +1480,6 @@ class TuyaBLEDevice:
                 )
                 raise
 
-    async def _resend_packets(self, packets: list[bytes]) -> None:
-        if self._expected_disconnect:
-            return
-        await self._ensure_connected()
-        if self._expected_disconnect:
-            return
-        await self._int_send_packet_while_connected(packets)
-
     async def _send_packets_locked(self, packets: list[bytes]) -> None:
         """Send command to device and read response."""
         try:
@@ -1081,10 +1494,7 @@ class TuyaBLEDevice:
                 BLEAK_BACKOFF_TIME,
                 ex,
             )
-            if self._is_paired:
-                asyncio.create_task(self._resend_packets(packets))
-            else:
-                asyncio.create_task(self._reconnect())
+            self._request_reconnect()
             raise BleakError from ex
         except BleakError as ex:
             # Disconnect so we can reset state and try again
@@ -1094,14 +1504,12 @@ class TuyaBLEDevice:
                 self.rssi,
                 ex,
             )
-            if self._is_paired:
-                asyncio.create_task(self._resend_packets(packets))
-            else:
-                asyncio.create_task(self._reconnect())
+            self._request_reconnect()
             raise
 
     async def _int_send_packets_locked(self, packets: list[bytes]) -> None:
         """Execute command and read response."""
+        started = time.monotonic()
         for packet in packets:
             if self._client:
                 try:
@@ -1127,6 +1535,7 @@ class TuyaBLEDevice:
                     exc_info=True,
                 )
                 raise BleakError()
+        self._latency[TuyaBLELatency.GATT_WRITE].add(time.monotonic() - started)
 
     def _get_key(self, security_flag: int) -> bytes:
         if security_flag == 1:
@@ -1136,6 +1545,13 @@ class TuyaBLEDevice:
         if security_flag == 5:
             return self._session_key
 
+    def _get_cipher(self, security_flag: int) -> Any:
+        cipher = self._ciphers.get(security_flag)
+        if cipher is None:
+            cipher = AES.new(self._get_key(security_flag), AES.MODE_ECB)
+            self._ciphers[security_flag] = cipher
+        return cipher
+
     def _parse_timestamp(self, data: bytes, start_pos: int) -> tuple(float, int):
         timestamp: float
         pos = start_pos
@@ -1160,53 +1576,83 @@ class TuyaBLEDevice:
             case _:
                 raise TuyaBLEDataFormatError()
 
-        _LOGGER.debug(
-            "%s: Received timestamp: %s",
-            self.address,
-            time.ctime(timestamp),
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "%s: Received timestamp: %s",
+                self.address,
+                time.ctime(timestamp),
+            )
         return (timestamp, end_pos)
 
     def _parse_datapoints_v3(
         self, timestamp: float, flags: int, data: bytes, start_pos: int
-    ) -> int:
-        datapoints: list[TuyaBLEDataPoint] = []
+    ) -> None:
+        """Parse datapoints with 1 byte value length."""
+        self._parse_datapoints(timestamp, flags, data, start_pos, 1)
 
+    def _parse_datapoints_v4(
+        self, timestamp: float, flags: int, data: bytes, start_pos: int
+    ) -> None:
+        """Parse datapoints with 2 bytes value length."""
+        self._parse_datapoints(timestamp, flags, data, start_pos, 2)
+
+    def _parse_datapoints(
+        self,
+        timestamp: float,
+        flags: int,
+        data: bytes,
+        start_pos: int,
+        len_size: int,
+    ) -> None:
+        self._update_datapoints(
+            timestamp, flags, self._decode_datapoints(data, start_pos, len_size)
+        )
+
+    @staticmethod
+    def _decode_datapoints(
+        data: bytes, start_pos: int, len_size: int
+    ) -> list[tuple[int, TuyaBLEDataPointType, Any]]:
+        """Decode datapoint records, nothing is updated if any is malformed."""
+        records: list[tuple[int, TuyaBLEDataPointType, Any]] = []
         pos = start_pos
-        while len(data) - pos >= 4:
+        while len(data) - pos >= 3 + len_size:
             id: int = data[pos]
             pos += 1
             _type: int = data[pos]
-            if _type > TuyaBLEDataPointType.DT_BITMAP.value:
+            if _type >= len(DATAPOINT_CODECS):
                 raise TuyaBLEDataFormatError()
-            type: TuyaBLEDataPointType = TuyaBLEDataPointType(_type)
-            pos += 1
-            data_len: int = data[pos]
+            codec = DATAPOINT_CODECS[_type]
+            type: TuyaBLEDataPointType = codec.type
             pos += 1
+            data_len: int = int.from_bytes(data[pos:pos + len_size], "big")  # fmt: skip
+            pos += len_size
             next_pos = pos + data_len
             if next_pos > len(data):
                 raise TuyaBLEDataLengthError()
-            raw_value = data[pos:next_pos]
-            match type:
-                case TuyaBLEDataPointType.DT_RAW | TuyaBLEDataPointType.DT_BITMAP:
-                    value = raw_value
-                case TuyaBLEDataPointType.DT_BOOL:
-                    value = int.from_bytes(raw_value, "big") != 0
-                case TuyaBLEDataPointType.DT_VALUE | TuyaBLEDataPointType.DT_ENUM:
-                    value = int.from_bytes(raw_value, "big", signed=True)
-                case TuyaBLEDataPointType.DT_STRING:
-                    value = raw_value.decode()
+            records.append((id, type, codec.decode(data[pos:next_pos])))
+            pos = next_pos
+        return records
 
-            _LOGGER.debug(
-                "%s: Received datapoint update, id: %s, type: %s: value: %s",
-                self.address,
-                id,
-                type.name,
-                value,
-            )
+    def _update_datapoints(
+        self,
+        timestamp: float,
+        flags: int,
+        records: list[tuple[int, TuyaBLEDataPointType, Any]],
+    ) -> None:
+        datapoints: list[TuyaBLEDataPoint] = []
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+
+        for id, type, value in records:
+            if debug:
+                _LOGGER.debug(
+                    "%s: Received datapoint update, id: %s, type: %s: value: %s",
+                    self.address,
+                    id,
+                    type.name,
+                    value,
+                )
             self._datapoints._update_from_device(id, timestamp, flags, type, value)
             datapoints.append(self._datapoints[id])
-            pos = next_pos
 
         self._fire_callbacks(datapoints)
 
@@ -1231,6 +1677,7 @@ class TuyaBLEDevice:
                 srand = data[6:12]
                 self._session_key = hashlib.md5(self._local_key + srand).digest()
                 self._auth_key = data[14:46]
+                self._ciphers.clear()
 
             case TuyaBLECode.FUN_SENDER_PAIR:
                 if len(data) != 1:
@@ -1249,6 +1696,11 @@ class TuyaBLEDevice:
                     raise TuyaBLEDataLengthError()
                 result = data[0]
 
+            case TuyaBLECode.FUN_SENDER_DPS_V4:
+                # Status is the last byte of the acknowledgement
+                if len(data) > 0:
+                    result = data[-1]
+
             case TuyaBLECode.FUN_RECEIVE_TIME1_REQ:
                 if len(data) != 0:
                     raise TuyaBLEDataLengthError()
@@ -1305,6 +1757,27 @@ class TuyaBLEDevice:
                 data = pack(">HBB", dp_seq_num, flags, 0)
                 asyncio.create_task(self._send_response(code, data, seq_num))
 
+            case TuyaBLECode.FUN_RECEIVE_DP_V4:
+                if len(data) < 6:
+                    raise TuyaBLEDataLengthError()
+                dp_seq_num = int.from_bytes(data[1:5], "big")
+                flags = data[5]
+                self._parse_datapoints_v4(time.time(), flags, data, 6)
+                data = pack(">BIBB", 0, dp_seq_num, flags, 0)
+                asyncio.create_task(self._send_response(code, data, seq_num))
+
+            case TuyaBLECode.FUN_RECEIVE_TIME_DP_V4:
+                timestamp: float
+                pos: int
+                if len(data) < 6:
+                    raise TuyaBLEDataLengthError()
+                dp_seq_num = int.from_bytes(data[1:5], "big")
+                flags = data[5]
+                timestamp, pos = self._parse_timestamp(data, 6)
+                self._parse_datapoints_v4(timestamp, flags, data, pos)
+                data = pack(">BIBB", 0, dp_seq_num, flags, 0)
+                asyncio.create_task(self._send_response(code, data, seq_num))
+
         if response_to != 0:
             future = self._input_expected_responses.pop(response_to, None)
             if future:
@@ -1321,19 +1794,22 @@ class TuyaBLEDevice:
 
     def _clean_input(self) -> None:
         self._input_buffer = None
+        self._input_view = None
+        self._input_length = 0
         self._input_expected_packet_num = 0
         self._input_expected_length = 0
 
     def _parse_input(self) -> None:
-        security_flag = self._input_buffer[0]
-        key = self._get_key(security_flag)
-        iv = self._input_buffer[1:17]
-        encrypted = self._input_buffer[17:]
+        self._protocol_stats.frames_received += 1
+        # The views keep the reassembled frame alive after the input is cleaned
+        buffer = self._input_view
+        security_flag = buffer[0]
+        iv = buffer[1:17]
+        encrypted = buffer[17:]
 
         self._clean_input()
 
-        cipher = AES.new(key, AES.MODE_CBC, iv)
-        raw = cipher.decrypt(encrypted)
+        raw = decrypt_cbc(self._get_cipher(security_flag), iv, encrypted)
 
         seq_num: int
         response_to: int
@@ -1354,11 +1830,13 @@ class TuyaBLEDevice:
             if calc_crc != data_crc:
                 raise TuyaBLEDataCRCError()
         data = raw[12:data_end_pos]
+        self._packet_trace.add("rx", seq_num, response_to, _code, length)
 
         code: TuyaBLECode
         try:
             code = TuyaBLECode(_code)
         except ValueError:
+            self._protocol_stats.unknown_codes += 1
             _LOGGER.debug(
                 "%s: Received unknown message: #%s %x, response to #%s, data %s",
                 self.address,
@@ -1369,34 +1847,38 @@ class TuyaBLEDevice:
             )
             return
 
-        if response_to != 0:
-            _LOGGER.debug(
-                "%s: Received: #%s %s, response to #%s",
-                self.address,
-                seq_num,
-                code.name,
-                response_to,
-            )
-        else:
-            _LOGGER.debug(
-                "%s: Received: #%s %s",
-                self.address,
-                seq_num,
-                code.name,
-            )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            if response_to != 0:
+                _LOGGER.debug(
+                    "%s: Received: #%s %s, response to #%s",
+                    self.address,
+                    seq_num,
+                    code.name,
+                    response_to,
+                )
+            else:
+                _LOGGER.debug(
+                    "%s: Received: #%s %s",
+                    self.address,
+                    seq_num,
+                    code.name,
+                )
 
         self._handle_command_or_response(seq_num, response_to, code, data)
 
     def _notification_handler(self, _sender: int, data: bytearray) -> None:
         """Handle notification responses."""
-        _LOGGER.debug("%s: Packet received: %s", self.address, data.hex())
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s: Packet received: %s", self.address, data.hex())
 
         pos: int = 0
         packet_num: int
 
         packet_num, pos = self._unpack_int(data, pos)
+        self._protocol_stats.fragments_received += 1
 
         if packet_num < self._input_expected_packet_num:
+            self._protocol_stats.unexpected_fragments += 1
             _LOGGER.error(
                 "%s: Unexpected packet (number %s) in notifications, " "expected %s",
                 self.address,
@@ -1404,15 +1886,48 @@ class TuyaBLEDevice:
                 self._input_expected_packet_num,
             )
             self._clean_input()
+            if packet_num != 0:
+                # Only a first fragment can start a new frame, the drop was
+                # counted already, so it is not counted as missing fragment
+                return
 
         if packet_num == self._input_expected_packet_num:
             if packet_num == 0:
-                self._input_buffer = bytearray()
                 self._input_expected_length, pos = self._unpack_int(data, pos)
                 pos += 1
-            self._input_buffer += data[pos:]
+                if self._input_expected_length > MAX_FRAME_LENGTH:
+                    self._protocol_stats.oversized_frames += 1
+                    _LOGGER.error(
+                        "%s: Unexpected length of data in notifications, "
+                        "expected %s",
+                        self.address,
+                        self._input_expected_length,
+                    )
+                    self._clean_input()
+                    return
+                # The whole frame length is known from the first packet, so
+                # fragments are copied once into a buffer allocated per frame
+                self._input_buffer = bytearray(self._input_expected_length)
+                self._input_view = memoryview(self._input_buffer)
+                self._input_length = 0
+            fragment = memoryview(data)[pos:]
+            end_pos = self._input_length + len(fragment)
+            if end_pos > self._input_expected_length:
+                self._protocol_stats.oversized_frames += 1
+                _LOGGER.error(
+                    "%s: Unexpected length of data in notifications, "
+                    "received %s expected %s",
+                    self.address,
+                    end_pos,
+                    self._input_expected_length,
+                )
+                self._clean_input()
+                return
+            self._input_view[self._input_length:end_pos] = fragment  # fmt: skip
+            self._input_length = end_pos
             self._input_expected_packet_num += 1
         else:
+            self._protocol_stats.missing_fragments += 1
             _LOGGER.error(
                 "%s: Missing packet (number %s) in notifications, received %s",
                 self.address,
@@ -1422,20 +1937,16 @@ class TuyaBLEDevice:
             self._clean_input()
             return
 
-        if len(self._input_buffer) > self._input_expected_length:
-            _LOGGER.error(
-                "%s: Unexpected length of data in notifications, "
-                "received %s expected %s",
-                self.address,
-                len(self._input_buffer),
-                self._input_expected_length,
-            )
-            self._clean_input()
-            return
-        elif len(self._input_buffer) == self._input_expected_length:
+        if self._input_length == self._input_expected_length:
             try:
                 self._parse_input()
             except TuyaBLEError as err:
+                if isinstance(err, TuyaBLEDataCRCError):
+                    self._protocol_stats.crc_errors += 1
+                elif isinstance(err, TuyaBLEDataLengthError):
+                    self._protocol_stats.length_errors += 1
+                elif isinstance(err, TuyaBLEDataFormatError):
+                    self._protocol_stats.format_errors += 1
                 _LOGGER.error(
                     "%s: Error parsing input: %s",
                     self.address,
@@ -1451,21 +1962,62 @@ class TuyaBLEDevice:
         for dp_id in datapoint_ids:
             dp = self._datapoints[dp_id]
             value = dp._get_value()
-            _LOGGER.debug(
-                "%s: Sending datapoint update, id: %s, type: %s: value: %s",
-                self.address,
-                dp.id,
-                dp.type.name,
-                dp.value,
-            )
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "%s: Sending datapoint update, id: %s, type: %s: value: %s",
+                    self.address,
+                    dp.id,
+                    dp.type.name,
+                    dp.value,
+                )
             data += pack(">BBB", dp.id, int(dp.type.value), len(value))
             data += value
 
         await self._send_packet(TuyaBLECode.FUN_SENDER_DPS, data)
 
-    async def _send_datapoints(self, datapoint_ids: list[int]) -> None:
+    async def _send_datapoints_v4(self, datapoint_ids: list[int]) -> None:
         """Send new values of datapoints to the device."""
-        if self._protocol_version == 3:
-            await self._send_datapoints_v3(datapoint_ids)
-        else:
-            raise TuyaBLEDeviceError(0)
+        data = bytearray()
+        data += pack(">BIB", 0, self._get_dp_seq_num(), 0)
+        for dp_id in datapoint_ids:
+            dp = self._datapoints[dp_id]
+            value = dp._get_value()
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "%s: Sending datapoint update, id: %s, type: %s: value: %s",
+                    self.address,
+                    dp.id,
+                    dp.type.name,
+                    dp.value,
+                )
+            data += pack(">BBH", dp.id, int(dp.type.value), len(value))
+            data += value
+
+        await self._send_packet(TuyaBLECode.FUN_SENDER_DPS_V4, data)
+
+    async def _send_datapoints(self, datapoint_ids: list[int]) -> None:
+        """Send new values of datapoints to the device.
+
+        Failing to connect is raised. If writing fails once connected, the
+        datapoints are sent again after reconnecting, unless connections
+        are made on demand.
+        """
+        # Protocol version is not known until the device is connected
+        await self._ensure_connected()
+        try:
+            if self._protocol_version >= 4:
+                await self._send_datapoints_v4(datapoint_ids)
+            elif self._protocol_version == 3:
+                await self._send_datapoints_v3(datapoint_ids)
+            else:
+                raise TuyaBLEDeviceError(0)
+        except BLEAK_EXCEPTIONS:
+            if self._on_demand or self._expected_disconnect:
+                raise
+            # Sent again by the supervisor once reconnected
+            _LOGGER.debug(
+                "%s: Writing datapoints %s failed, sending after reconnect",
+                self.address,
+                datapoint_ids,
+            )
+            self._request_reconnect(datapoint_ids)